@@ -0,0 +1,206 @@
+"""
+Context Registry for CrewAI Scripts
+
+Resolves the project context from a declarative manifest
+(context_manifest.json) instead of hard-coded paths, and loads it through
+one shared, cached loader that every crew in the process reuses.
+
+A manifest maps context keys to paths relative to its "root":
+
+    {
+      "root": "../..",
+      "sources": {
+        "project_context": "docs/PROJECT_CONTEXT.md",
+        "javascript": "public/**/*.js",
+        "notes": {"path": "docs/NOTES.md", "optional": true}
+      }
+    }
+
+Glob patterns may match several files; each file's content is preceded by
+a "--- path ---" header, even when only one file matches, so the prompt
+format doesn't change as files are added. Missing or empty required sources raise
+ContextSourceError before anything is sent to a model.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import threading
+
+from context_snapshot import normalize_text
+
+DEFAULT_MANIFEST = Path(__file__).resolve().parent / 'context_manifest.json'
+LOADER_MAX_WORKERS = 8
+
+_GLOB_CHARS = set('*?[')
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+class ContextSourceError(RuntimeError):
+    """Raised when required context sources are missing or empty"""
+
+    def __init__(self, problems):
+        self.problems = problems
+        details = '\n'.join(f"  - {key}: {problem}" for key, problem in problems.items())
+        super().__init__(f"Context sources missing or empty:\n{details}")
+
+# ============================================================================
+# SHARED LOADER
+# ============================================================================
+
+class ContextLoader:
+    """
+    Thread-safe file loader shared by every registry in the process.
+    Files are read concurrently and cached until their size or mtime changes.
+    """
+
+    def __init__(self, max_workers=LOADER_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def read(self, path):
+        """Normalized text of one file, from the cache when unchanged"""
+        path = Path(path).resolve()
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        text = normalize_text(path.read_text(encoding='utf-8'))
+        with self._lock:
+            self._cache[path] = (signature, text)
+        return text
+
+    def read_many(self, paths):
+        """Read several files concurrently. Returns {path: text}."""
+        paths = list(dict.fromkeys(paths))
+        if len(paths) <= 1:
+            return {path: self.read(path) for path in paths}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+            return dict(zip(paths, executor.map(self.read, paths)))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+_loader = ContextLoader()
+
+def get_loader():
+    """The process-wide shared context loader"""
+    return _loader
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class ContextRegistry:
+    """Context sources declared by one manifest"""
+
+    def __init__(self, manifest, root=None, loader=None):
+        """
+        `manifest` is a path to a JSON manifest or an already parsed dict.
+        `root` overrides the manifest's root directory.
+        """
+        if isinstance(manifest, dict):
+            data = manifest
+            base = Path.cwd()
+        else:
+            manifest = Path(manifest)
+            data = json.loads(manifest.read_text(encoding='utf-8'))
+            base = manifest.resolve().parent
+
+        self.root = Path(root) if root is not None else (base / data.get('root', '.')).resolve()
+        self.loader = loader or get_loader()
+        self.sources = {}
+        for key, spec in data['sources'].items():
+            if isinstance(spec, str):
+                spec = {'path': spec}
+            self.sources[key] = {'path': spec['path'], 'optional': spec.get('optional', False)}
+
+    @staticmethod
+    def _is_glob(pattern):
+        return bool(_GLOB_CHARS & set(pattern))
+
+    def _match(self, pattern):
+        if not self._is_glob(pattern):
+            path = self.root / pattern
+            return [path] if path.is_file() else []
+        if pattern.endswith('**'):
+            # 'public/**' means every file below public/
+            pattern += '/*'
+        return sorted(path for path in self.root.glob(pattern) if path.is_file())
+
+    def resolve(self):
+        """
+        Resolve every source to its files. Returns {key: [Path, ...]}.
+        Raises ContextSourceError if a required source matches nothing.
+        """
+        resolved = {}
+        problems = {}
+        for key, spec in self.sources.items():
+            paths = self._match(spec['path'])
+            if not paths and not spec['optional']:
+                problems[key] = f"no file matches {self.root / spec['path']}"
+            resolved[key] = paths
+        if problems:
+            raise ContextSourceError(problems)
+        return resolved
+
+    def files(self):
+        """All resolved files keyed by their root-relative path"""
+        return {
+            path.relative_to(self.root).as_posix(): path
+            for paths in self.resolve().values()
+            for path in paths
+        }
+
+    def load(self, read=None):
+        """
+        Load every source. Returns {key: text}.
+
+        `read` maps a root-relative file name to its text (e.g. a context
+        snapshot); by default files are read concurrently through the shared
+        loader. Raises ContextSourceError if a required source is empty.
+        """
+        resolved = self.resolve()
+        if read is None:
+            texts = self.loader.read_many(path for paths in resolved.values() for path in paths)
+        else:
+            texts = {
+                path: read(path.relative_to(self.root).as_posix())
+                for paths in resolved.values()
+                for path in paths
+            }
+
+        context = {}
+        problems = {}
+        for key, paths in resolved.items():
+            if self._is_glob(self.sources[key]['path']):
+                text = '\n'.join(
+                    f"--- {path.relative_to(self.root).as_posix()} ---\n{texts[path]}"
+                    for path in paths
+                )
+            else:
+                text = texts[paths[0]] if paths else ''
+            if not any(texts[path].strip() for path in paths) and not self.sources[key]['optional']:
+                problems[key] = "empty"
+            context[key] = text
+        if problems:
+            raise ContextSourceError(problems)
+        return context
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+def get_registry(manifest=DEFAULT_MANIFEST):
+    """Shared registry for a manifest file, created once per process"""
+    manifest = Path(manifest).resolve()
+    with _registries_lock:
+        if manifest not in _registries:
+            _registries[manifest] = ContextRegistry(manifest)
+        return _registries[manifest]
@@ -0,0 +1,394 @@
+"""
+Context Snapshot for Beautiful Timetracker App
+
+Packages the processed CrewAI context (normalized text, chunk boundaries,
+token counts and a small retrieval index) into one binary file with a
+format version. crewai_config.load_project_context memory-maps the snapshot
+instead of re-reading and decoding every context file on startup.
+
+Staleness is decided by the source files' size/mtime/SHA-256 only. The git
+revision stored in the header is informational (shown by `build`).
+
+Build the snapshot with:
+    python context_snapshot.py build
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import mmap
+import re
+import struct
+import subprocess
+import sys
+import time
+
+# ============================================================================
+# SNAPSHOT FORMAT
+# ============================================================================
+#
+# MAGIC | header length (uint32) | JSON header
+#       | index length (uint32) | JSON index | UTF-8 text blob
+#
+# Lengths are little endian. The header is parsed on every load and only
+# records, per source: path, size/mtime/sha256 of the source file, the byte
+# range of its normalized text inside the blob and its token count.
+# The index holds each source's chunk boundaries (relative to the start of
+# its text) and the retrieval terms; it is parsed on first use only, since
+# loading the context for a crew never needs it.
+
+PROJECT_ROOT = Path(__file__).parent
+SNAPSHOT_PATH = PROJECT_ROOT / '.context_snapshot.bin'
+
+MAGIC = b'CTXSNAP1'
+FORMAT_VERSION = 2
+CHUNK_MAX_CHARS = 2000
+MIN_TERM_LENGTH = 3
+
+_LENGTH = struct.Struct('<I')
+_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+_TERM_PATTERN = re.compile(r'[a-z_][a-z0-9_]+')
+
+# ============================================================================
+# TEXT PROCESSING
+# ============================================================================
+
+def normalize_text(text):
+    """Normalize line endings and strip trailing whitespace"""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines)
+
+def count_tokens(text):
+    """Approximate token count (words and punctuation)"""
+    return len(_TOKEN_PATTERN.findall(text))
+
+def chunk_boundaries(text, max_chars=CHUNK_MAX_CHARS):
+    """
+    Split text into chunks of whole paragraphs, falling back to whole lines
+    when a paragraph is too long. Returns (start, end) character offsets.
+    """
+    # Candidate cut points: after blank lines first, then after any line
+    paragraph_ends = [m.end() for m in re.finditer(r'\n\n+', text)] + [len(text)]
+    line_ends = [m.end() for m in re.finditer(r'\n', text)] + [len(text)]
+
+    boundaries = []
+    start = 0
+    while start < len(text):
+        limit = start + max_chars
+        cut = max((p for p in paragraph_ends if start < p <= limit), default=None)
+        if cut is None:
+            cut = max((p for p in line_ends if start < p <= limit), default=None)
+        if cut is None:
+            # A single line longer than max_chars stays whole
+            cut = min(p for p in line_ends if p > start)
+        boundaries.append((start, cut))
+        start = cut
+    return boundaries
+
+def index_terms(text):
+    """Unique lowercase terms used for retrieval"""
+    return {term for term in _TERM_PATTERN.findall(text.lower()) if len(term) >= MIN_TERM_LENGTH}
+
+def file_sha256(path):
+    """SHA-256 of a file's raw bytes"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def git_revision():
+    """Current git revision, or 'unknown' outside a git checkout"""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def build_snapshot(sources, snapshot_path=SNAPSHOT_PATH):
+    """
+    Build a snapshot for `sources` (a dict of context key -> Path).
+    Missing sources are recorded as empty so staleness is still detected
+    once they appear.
+    """
+    blob = bytearray()
+    entries = {}
+    chunk_table = {}
+    terms = {}
+
+    for key, path in sources.items():
+        path = Path(path)
+        if path.exists():
+            stat = path.stat()
+            raw = path.read_bytes()
+            text = normalize_text(raw.decode('utf-8'))
+            source_meta = {
+                'exists': True,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': hashlib.sha256(raw).hexdigest(),
+            }
+        else:
+            text = ''
+            source_meta = {'exists': False, 'size': 0, 'mtime_ns': 0, 'sha256': ''}
+
+        encoded = text.encode('utf-8')
+        chunks = []
+        byte_start = 0
+        for chunk_id, (start, end) in enumerate(chunk_boundaries(text)):
+            # Store byte offsets so chunks can be sliced straight from the mmap
+            chunk_text = text[start:end]
+            byte_end = byte_start + len(chunk_text.encode('utf-8'))
+            chunks.append([byte_start, byte_end, count_tokens(chunk_text)])
+            byte_start = byte_end
+            for term in index_terms(chunk_text):
+                terms.setdefault(term, []).append([key, chunk_id])
+
+        entries[key] = {
+            'path': str(path),
+            **source_meta,
+            'offset': len(blob),
+            'length': len(encoded),
+            'tokens': sum(chunk[2] for chunk in chunks),
+        }
+        chunk_table[key] = chunks
+        blob.extend(encoded)
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'git_revision': git_revision(),
+        'created': time.time(),
+        'sources': entries,
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    index_bytes = json.dumps({'chunks': chunk_table, 'terms': terms}, separators=(',', ':')).encode('utf-8')
+
+    snapshot_path = Path(snapshot_path)
+    tmp_path = snapshot_path.with_suffix(snapshot_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        f.write(_LENGTH.pack(len(index_bytes)))
+        f.write(index_bytes)
+        f.write(blob)
+    tmp_path.replace(snapshot_path)
+
+    return snapshot_path
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+class ContextSnapshot:
+    """Read-only, memory-mapped view of a context snapshot"""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty snapshot file: {self.path}")
+
+        try:
+            self.header, self._index_range, self._blob_start = self._read_header()
+        except (ValueError, struct.error, KeyError, TypeError) as error:
+            # json.JSONDecodeError and UnicodeDecodeError are ValueErrors
+            self.close()
+            raise ValueError(f"Invalid context snapshot {self.path}: {error}") from error
+        self._index = None
+        self._cache = {}
+
+    def _read_length(self, offset, what):
+        if offset + _LENGTH.size > len(self._mmap):
+            raise ValueError(f"truncated {what}")
+        (length,) = _LENGTH.unpack_from(self._mmap, offset)
+        end = offset + _LENGTH.size + length
+        if end > len(self._mmap):
+            raise ValueError(f"truncated {what}")
+        return offset + _LENGTH.size, end
+
+    def _read_header(self):
+        """
+        Parse and validate the header (but not the index).
+        Returns (header, (index start, index end), blob offset).
+        """
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a context snapshot")
+
+        header_start, header_end = self._read_length(len(MAGIC), "header")
+        header = json.loads(self._mmap[header_start:header_end])
+        if header.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"unsupported format version {header.get('format_version')}")
+        if not isinstance(header.get('sources'), dict):
+            raise ValueError("header has no sources")
+
+        index_start, blob_start = self._read_length(header_end, "index")
+        # Every source's text must lie inside the file
+        for entry in header['sources'].values():
+            if blob_start + entry['offset'] + entry['length'] > len(self._mmap):
+                raise ValueError("truncated text blob")
+        return header, (index_start, blob_start), blob_start
+
+    @property
+    def index(self):
+        """Chunk boundaries and retrieval terms, parsed on first use"""
+        if self._index is None:
+            start, end = self._index_range
+            try:
+                index = json.loads(self._mmap[start:end])
+                if not isinstance(index.get('chunks'), dict) or not isinstance(index.get('terms'), dict):
+                    raise ValueError("index has no chunks or terms")
+            except (ValueError, AttributeError) as error:
+                raise ValueError(f"Invalid context snapshot index {self.path}: {error}") from error
+            self._index = index
+        return self._index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    @property
+    def sources(self):
+        return self.header['sources']
+
+    def _slice(self, key, start, end):
+        offset = self._blob_start + self.sources[key]['offset']
+        return self._mmap[offset + start:offset + end].decode('utf-8')
+
+    def text(self, key):
+        """Full normalized text of a source (decoded once, then cached)"""
+        if key not in self._cache:
+            self._cache[key] = self._slice(key, 0, self.sources[key]['length'])
+        return self._cache[key]
+
+    def chunks(self, key):
+        """Chunk texts of a source"""
+        return [self._slice(key, start, end) for start, end, _ in self.index['chunks'][key]]
+
+    def tokens(self, key):
+        """Approximate token count of a source"""
+        return self.sources[key]['tokens']
+
+    def search(self, query, limit=5):
+        """
+        Return the best matching chunks for `query` as
+        (key, chunk_id, score, text) tuples, ranked by matched terms.
+        """
+        scores = {}
+        for term in index_terms(query):
+            for key, chunk_id in self.index['terms'].get(term, []):
+                scores[(key, chunk_id)] = scores.get((key, chunk_id), 0) + 1
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        results = []
+        for (key, chunk_id), score in ranked:
+            start, end, _ = self.index['chunks'][key][chunk_id]
+            results.append((key, chunk_id, score, self._slice(key, start, end)))
+        return results
+
+    def stale_sources(self, sources):
+        """
+        Return the keys in `sources` whose files no longer match the snapshot.
+        Files are only hashed when their size or mtime changed.
+        """
+        stale = []
+        for key, path in sources.items():
+            entry = self.sources.get(key)
+            path = Path(path)
+            if entry is None or entry['path'] != str(path):
+                stale.append(key)
+                continue
+
+            if not path.exists():
+                if entry['exists']:
+                    stale.append(key)
+                continue
+            if not entry['exists']:
+                stale.append(key)
+                continue
+
+            stat = path.stat()
+            if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+                continue
+            if stat.st_size != entry['size'] or file_sha256(path) != entry['sha256']:
+                stale.append(key)
+        return stale
+
+def load_snapshot(sources, snapshot_path=SNAPSHOT_PATH):
+    """
+    Open the snapshot if it exists, matches the format version and is
+    up to date for `sources`. Returns None otherwise.
+    """
+    if not Path(snapshot_path).exists():
+        return None
+
+    try:
+        snapshot = ContextSnapshot(snapshot_path)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        usable = not snapshot.stale_sources(sources)
+    except (OSError, KeyError, TypeError):
+        usable = False
+    if not usable:
+        snapshot.close()
+        return None
+
+    return snapshot
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    """Build or check the context snapshot"""
+    # Imported here: context_registry itself imports from this module
+    from context_registry import DEFAULT_MANIFEST, get_registry
+
+    command = argv[1] if len(argv) > 1 else 'build'
+    sources = get_registry(DEFAULT_MANIFEST).files()
+
+    if command == 'build':
+        path = build_snapshot(sources)
+        with ContextSnapshot(path) as snapshot:
+            print(f"✅ Snapshot written: {path} ({path.stat().st_size:,} bytes)")
+            print(f"   Revision: {snapshot.header['git_revision']}")
+            for key, entry in snapshot.sources.items():
+                chunks = len(snapshot.index['chunks'][key])
+                status = f"{entry['tokens']:,} tokens, {chunks} chunks" if entry['exists'] else "missing"
+                print(f"   - {key}: {status}")
+        return 0
+
+    if command == 'check':
+        if not SNAPSHOT_PATH.exists():
+            print(f"❌ No snapshot at {SNAPSHOT_PATH}")
+            return 1
+        with ContextSnapshot(SNAPSHOT_PATH) as snapshot:
+            stale = snapshot.stale_sources(sources)
+        if stale:
+            print(f"⚠️  Snapshot is stale: {', '.join(stale)}")
+            return 1
+        print("✅ Snapshot is up to date")
+        return 0
+
+    print(f"Unknown command: {command} (use 'build' or 'check')")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
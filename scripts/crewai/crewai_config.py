@@ -5,7 +5,15 @@ This is the main configuration file for CrewAI agents working on this project.
 All agents are pre-configured with project context to ensure correct JavaScript code generation.
 """
 
-from crewai import Agent, Task, Crew
+# Imported first so CREWAI_PROFILE / --profile can time the imports below
+from crewai_profiling import profiled, record_agent_context, section
+from crewai import Agent, Task, Crew, LLM
+from context_registry import ContextSourceError, get_registry
+from context_snapshot import count_tokens, load_snapshot
+from llm_scheduler import get_scheduler
+from plan_store import save_plan
+from review_chunks import REVIEW_CHUNK_MAX_CHARS, merge_review_findings, split_review_chunks
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 
@@ -14,46 +22,79 @@ import os
 # ============================================================================
 
 PROJECT_ROOT = Path(__file__).parent
-CONTEXT_DIR = PROJECT_ROOT / 'docs'
-CODE_DIR = PROJECT_ROOT
+# Context files are declared in context_manifest.json (see context_registry.py)
+CONTEXT_MANIFEST = PROJECT_ROOT / 'context_manifest.json'
+
+REVIEW_MAX_WORKERS = 4
 
 # ============================================================================
 # CONTEXT FILE LOADER
 # ============================================================================
 
-def load_project_context():
-    """Load all project context files"""
-    context = {}
-    
-    # Core documentation
-    context_files = {
-        'project_context': CONTEXT_DIR / 'PROJECT_CONTEXT.md',
-        'setup_guide': CONTEXT_DIR / 'CREWAI_SETUP.md',
-        'quick_start': CONTEXT_DIR / 'CREWAI_QUICK_START.md',
-        'readme': PROJECT_ROOT / 'README.md',
-    }
-    
-    # Code files
-    code_files = {
-        'html': CODE_DIR / 'index.html',
-        'javascript': CODE_DIR / 'app.js',
-        'css': CODE_DIR / 'styles.css',
-    }
-    
-    # Load all files
-    for key, path in {**context_files, **code_files}.items():
-        if path.exists():
-            context[key] = path.read_text(encoding='utf-8')
-        else:
-            print(f"⚠️ Warning: {path} not found")
-            context[key] = ""
-    
-    return context
+def get_context_sources():
+    """Return the context files from the manifest, keyed by repo-relative path"""
+    return get_registry(CONTEXT_MANIFEST).files()
+
+@profiled()
+def load_project_context(use_snapshot=True):
+    """
+    Load all project context files.
+    
+    Uses the prebuilt context snapshot (see context_snapshot.py) when it is
+    up to date, otherwise reads the files through the shared context loader.
+    Both paths return the same normalized text (LF line endings, no trailing
+    whitespace). Raises ContextSourceError if a source is missing or empty.
+    """
+    registry = get_registry(CONTEXT_MANIFEST)
+    
+    if use_snapshot:
+        snapshot = load_snapshot(registry.files())
+        if snapshot is not None:
+            with snapshot:
+                return registry.load(read=snapshot.text)
+    
+    return registry.load()
+
+# ============================================================================
+# LLM CONFIGURATION
+# ============================================================================
+
+DEFAULT_MODEL = 'gpt-4o-mini'
+
+def _estimate_message_tokens(messages):
+    """Approximate prompt tokens of a string or a list of chat messages"""
+    if isinstance(messages, str):
+        return count_tokens(messages)
+    return sum(count_tokens(str(message.get('content', ''))) for message in messages)
+
+class ScheduledLLM(LLM):
+    """
+    LLM whose every model call goes through the shared scheduler
+    (see llm_scheduler.py), so rate limits, retries on 429 errors and the
+    per-call timeout apply to each request instead of a whole crew run.
+    """
+    
+    def call(self, messages, *args, **kwargs):
+        return get_scheduler().call(
+            super().call,
+            messages,
+            *args,
+            estimated_tokens=_estimate_message_tokens(messages),
+            **kwargs
+        )
+
+def create_scheduled_llm():
+    """Create the LLM used by all agents in this file"""
+    
+    model = os.environ.get('OPENAI_MODEL_NAME', DEFAULT_MODEL)
+    # Pass the timeout to the client too so a timed-out request is really ended
+    return ScheduledLLM(model=model, timeout=get_scheduler().config.timeout or None)
 
 # ============================================================================
 # AGENT CONFIGURATION
 # ============================================================================
 
+@profiled()
 def create_javascript_developer_agent(context):
     """
     Create a JavaScript developer agent with full project context.
@@ -115,6 +156,8 @@ def create_javascript_developer_agent(context):
     - Provide complete, working code
     """
     
+    record_agent_context('Vanilla JavaScript Developer', context, backstory)
+    
     agent = Agent(
         role='Vanilla JavaScript Developer',
         goal='Implement features in vanilla JavaScript following existing project patterns exactly',
@@ -122,11 +165,13 @@ def create_javascript_developer_agent(context):
         verbose=True,
         allow_delegation=False,
         max_iter=3,
-        memory=True
+        memory=True,
+        llm=create_scheduled_llm()
     )
     
     return agent
 
+@profiled()
 def create_code_reviewer_agent(context):
     """
     Create a code reviewer agent to verify JavaScript code quality.
@@ -149,12 +194,15 @@ def create_code_reviewer_agent(context):
     5. It integrates properly with existing code
     """
     
+    record_agent_context('JavaScript Code Reviewer', context, backstory)
+    
     agent = Agent(
         role='JavaScript Code Reviewer',
         goal='Review and verify JavaScript code matches project standards',
         backstory=backstory,
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        llm=create_scheduled_llm()
     )
     
     return agent
@@ -163,6 +211,7 @@ def create_code_reviewer_agent(context):
 # TASK TEMPLATES
 # ============================================================================
 
+@profiled()
 def create_feature_task(description, agent):
     """Create a task for implementing a new feature"""
     
@@ -196,6 +245,7 @@ def create_feature_task(description, agent):
     
     return task
 
+@profiled()
 def create_review_task(code_to_review, reviewer_agent):
     """Create a task for reviewing generated code"""
     
@@ -220,10 +270,106 @@ def create_review_task(code_to_review, reviewer_agent):
     
     return task
 
+# ============================================================================
+# CHUNKED REVIEW
+# ============================================================================
+
+@profiled()
+def create_chunk_reviewer_agent(context):
+    """
+    Create a reviewer with minimal shared context for chunked reviews.
+    Only the project context is included so every chunk call stays small.
+    """
+    
+    backstory = f"""
+    You are a senior JavaScript code reviewer specializing in vanilla JavaScript projects.
+    You review one part of a larger change at a time.
+    
+    PROJECT CONTEXT:
+    {context.get('project_context', '')}
+    
+    Your job is to review code and ensure:
+    1. It's JavaScript (NOT Python, NOT TypeScript)
+    2. It follows existing patterns in app.js
+    3. It uses vanilla JavaScript (no frameworks)
+    4. It matches the existing code style
+    5. It integrates properly with existing code
+    """
+    
+    record_agent_context('JavaScript Code Reviewer (chunk)', context, backstory)
+    
+    agent = Agent(
+        role='JavaScript Code Reviewer',
+        goal='Review and verify JavaScript code matches project standards',
+        backstory=backstory,
+        verbose=False,
+        allow_delegation=False,
+        llm=create_scheduled_llm()
+    )
+    
+    return agent
+
+@profiled()
+def create_chunk_review_task(chunk, index, total, reviewer_agent):
+    """Create a review task for a single chunk of a larger change"""
+    
+    task = Task(
+        description=f"""
+        Review part {index} of {total} of a larger change ({chunk['label']}):
+        
+        {chunk['content']}
+        
+        Check:
+        1. Is it JavaScript (NOT Python)?
+        2. Does it follow patterns in app.js?
+        3. Does it use vanilla JavaScript (no frameworks)?
+        4. Does it match existing code style?
+        5. Will it integrate properly with existing code?
+        
+        Report each finding on its own line starting with "- ".
+        Only review this part; other parts are reviewed separately.
+        """,
+        agent=reviewer_agent,
+        expected_output="Bullet list of review findings for this part of the change"
+    )
+    
+    return task
+
+@profiled()
+def review_code(code_to_review, context=None, max_chars=REVIEW_CHUNK_MAX_CHARS, max_workers=REVIEW_MAX_WORKERS):
+    """
+    Review generated code in concurrent chunks and return one merged report.
+    
+    Latency scales with the largest chunk instead of the whole change.
+    
+    Usage:
+        report = review_code(result)
+    """
+    
+    if context is None:
+        context = load_project_context()
+    
+    chunks = split_review_chunks(code_to_review, max_chars)
+    
+    def review_chunk(indexed_chunk):
+        index, chunk = indexed_chunk
+        # Agents keep per-run state, so each worker gets its own reviewer
+        reviewer = create_chunk_reviewer_agent(context)
+        task = create_chunk_review_task(chunk, index, len(chunks), reviewer)
+        crew = Crew(agents=[reviewer], tasks=[task], verbose=False)
+        with section('review_code.kickoff'):
+            return chunk['label'], crew.kickoff()
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        results = list(executor.map(review_chunk, enumerate(chunks, 1)))
+    
+    return merge_review_findings(results)
+
 # ============================================================================
 # CREW FACTORY
 # ============================================================================
 
+@profiled()
 def create_development_crew():
     """Create a development crew with JavaScript developer and reviewer"""
     
@@ -245,10 +391,14 @@ def create_development_crew():
 # QUICK START FUNCTIONS
 # ============================================================================
 
-def implement_feature(feature_description):
+@profiled()
+def implement_feature(feature_description, issue_id=None):
     """
     Quick function to implement a feature.
     
+    When `issue_id` is given the result is saved to the plan store
+    (see plan_store.py) instead of a new implementations/ markdown file.
+    
     Usage:
         result = implement_feature("Add export to CSV functionality")
     """
@@ -268,10 +418,17 @@ def implement_feature(feature_description):
     )
     
     # Execute
-    result = crew.kickoff()
+    with section('implement_feature.kickoff'):
+        result = crew.kickoff()
+    
+    if issue_id is not None:
+        feature = (feature_description.strip().splitlines() or [''])[0]
+        entry = save_plan(issue_id, result, feature=feature, context=context)
+        print(f"📝 Plan saved: {entry['id']} (issue #{entry['issue']})")
     
     return result
 
+@profiled()
 def test_setup():
     """Test that CrewAI is configured correctly"""
     
@@ -279,15 +436,10 @@ def test_setup():
     print("=" * 60)
     
     # Load context
-    context = load_project_context()
-    
-    # Check if context loaded
-    if not context.get('javascript'):
-        print("❌ ERROR: Could not load app.js")
-        return False
-    
-    if not context.get('html'):
-        print("❌ ERROR: Could not load index.html")
+    try:
+        context = load_project_context()
+    except ContextSourceError as e:
+        print(f"❌ ERROR: {e}")
         return False
     
     print("✅ Context files loaded successfully")
@@ -8,6 +8,7 @@ IMPORTANT: This is a template - adjust based on your CrewAI setup!
 """
 
 from crewai import Agent, Task, Crew
+from context_registry import get_registry
 from pathlib import Path
 
 # ============================================================================
@@ -16,18 +17,11 @@ from pathlib import Path
 
 def load_context_files():
     """Load all necessary context files for CrewAI"""
-    base_path = Path(__file__).parent
-    
-    context = {
-        'project_context': (base_path / 'docs' / 'PROJECT_CONTEXT.md').read_text(),
-        'html': (base_path / 'index.html').read_text(),
-        'js': (base_path / 'app.js').read_text(),
-        'css': (base_path / 'styles.css').read_text(),
-        'readme': (base_path / 'README.md').read_text(),
-        'setup_guide': (base_path / 'docs' / 'CREWAI_SETUP.md').read_text(),
-    }
-    
-    return context
+    # Paths are declared in context_manifest.json; missing or empty files
+    # raise ContextSourceError instead of producing an empty prompt
+    registry = get_registry(Path(__file__).parent / 'context_manifest.json')
+    
+    return registry.load()
 
 # ============================================================================
 # STEP 2: Create Agent with Full Context
@@ -48,7 +42,7 @@ def create_javascript_agent(context):
     {context['html']}
     
     CURRENT JAVASCRIPT CODE (FOLLOW THESE PATTERNS):
-    {context['js']}
+    {context['javascript']}
     
     CURRENT CSS STYLING (FOLLOW THESE PATTERNS):
     {context['css']}
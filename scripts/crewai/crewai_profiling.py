@@ -0,0 +1,355 @@
+"""
+Profiling Hooks for CrewAI Scripts
+
+Opt-in profiling for crewai_config.py and verify_crewai_setup.py.
+Enable it with the CREWAI_PROFILE=1 environment variable or the --profile flag:
+
+    CREWAI_PROFILE=1 python crewai_config.py
+    python verify_crewai_setup.py --profile
+
+When enabled, the report printed on exit shows:
+- time spent per section (context loading, agent/task creation, crew runs)
+- import-time breakdown per top-level package
+- memory per context section and per agent (including duplicated context)
+- top cProfile functions and tracemalloc allocation sites
+
+Set CREWAI_PROFILE_OUTPUT=path.prof to also dump the raw cProfile stats.
+When profiling is disabled every hook is a no-op.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import atexit
+import cProfile
+import importlib.abc
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+PROFILE_ENV_VAR = 'CREWAI_PROFILE'
+PROFILE_OUTPUT_ENV_VAR = 'CREWAI_PROFILE_OUTPUT'
+PROFILE_FLAG = '--profile'
+
+TOP_N = 15
+
+# ============================================================================
+# IMPORT TIMER
+# ============================================================================
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wrap a module loader and record how long exec_module takes"""
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the real loader back so nothing else ever sees the wrapper
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+
+        self._timer.enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave(module.__name__, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that records self time of every module import"""
+
+    def __init__(self):
+        self.self_times = {}
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def enter(self):
+        self._stack().append(0.0)
+
+    def leave(self, name, elapsed):
+        # Subtract nested imports so each module only counts its own time
+        stack = self._stack()
+        child_time = stack.pop()
+        self.self_times[name] = self.self_times.get(name, 0.0) + elapsed - child_time
+        if stack:
+            stack[-1] += elapsed
+
+    def by_package(self):
+        """Aggregate self time per top-level package"""
+        totals = {}
+        for name, elapsed in self.self_times.items():
+            package = name.split('.')[0]
+            totals[package] = totals.get(package, 0.0) + elapsed
+        return totals
+
+# ============================================================================
+# PROFILER
+# ============================================================================
+
+class Profiler:
+    """Collects section timings, memory and cProfile data for one process"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sections = {}
+        self.agent_context = {}
+        self.import_timer = None
+        self._profile = None
+        self._thread_profiles = []
+        self._original_thread_run = None
+        self._baseline_snapshot = None
+        self._lock = threading.Lock()
+        self._started = None
+
+    def enable(self):
+        """Start collecting. Safe to call more than once."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._started = time.perf_counter()
+
+        self.import_timer = _ImportTimer()
+        sys.meta_path.insert(0, self.import_timer)
+
+        tracemalloc.start()
+        self._baseline_snapshot = tracemalloc.take_snapshot()
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self._profile_threads()
+
+        atexit.register(self.report)
+
+    def _profile_threads(self):
+        """
+        Before Python 3.12, cProfile only sees the thread that enabled it, so
+        give every thread started from now on (review workers, scheduler/
+        executor threads that make the model calls) its own profiler, merged
+        into the report. From 3.12 cProfile uses sys.monitoring, which
+        already covers every thread and allows only one active profiler.
+        """
+        if sys.version_info >= (3, 12):
+            return
+
+        profiler = self
+        original_run = threading.Thread.run
+        self._original_thread_run = original_run
+
+        def run(thread):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except (RuntimeError, ValueError):
+                # Never let profiling stop a worker from doing its job
+                original_run(thread)
+                return
+            try:
+                original_run(thread)
+            finally:
+                profile.disable()
+                with profiler._lock:
+                    profiler._thread_profiles.append(profile)
+
+        threading.Thread.run = run
+
+    @contextmanager
+    def section(self, name):
+        """Time a block of code (and its traced memory delta)"""
+        if not self.enabled:
+            yield
+            return
+
+        memory_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            memory_delta = tracemalloc.get_traced_memory()[0] - memory_before
+            with self._lock:
+                stats = self.sections.setdefault(name, {'calls': 0, 'total': 0.0, 'max': 0.0, 'memory': 0})
+                stats['calls'] += 1
+                stats['total'] += elapsed
+                stats['max'] = max(stats['max'], elapsed)
+                stats['memory'] += memory_delta
+
+    def record_agent_context(self, agent_name, context, prompt):
+        """Record which context sections were embedded in an agent's prompt"""
+        if not self.enabled:
+            return
+
+        included = {}
+        for key, value in context.items():
+            if value and value in prompt:
+                included[key] = len(value.encode('utf-8'))
+
+        with self._lock:
+            self.agent_context.setdefault(agent_name, []).append({
+                'prompt_bytes': len(prompt.encode('utf-8')),
+                'sections': included,
+            })
+
+    def context_memory(self):
+        """
+        Break prompt memory down by context section.
+        Returns {section: {'bytes', 'copies', 'duplicated'}}.
+        """
+        sections = {}
+        for records in self.agent_context.values():
+            for record in records:
+                for key, size in record['sections'].items():
+                    entry = sections.setdefault(key, {'bytes': size, 'copies': 0, 'duplicated': 0})
+                    entry['copies'] += 1
+        for entry in sections.values():
+            entry['duplicated'] = entry['bytes'] * (entry['copies'] - 1)
+        return sections
+
+    def report(self, stream=None):
+        """Print the profiling report"""
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        self._profile.disable()
+        if self._original_thread_run is not None:
+            threading.Thread.run = self._original_thread_run
+            self._original_thread_run = None
+
+        total = time.perf_counter() - self._started
+        current, peak = tracemalloc.get_traced_memory()
+        # Snapshot before building the report so its own allocations are left out
+        allocations = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+
+        def write(line=''):
+            print(line, file=stream)
+
+        write()
+        write("⏱️  CrewAI Profiling Report")
+        write("=" * 60)
+        write(f"Wall time: {total:.3f}s | traced memory: {current / 1024:,.0f} KiB (peak {peak / 1024:,.0f} KiB)")
+
+        write("\n📊 Sections:")
+        for name, stats in sorted(self.sections.items(), key=lambda item: -item[1]['total']):
+            write(f"  {name:<40} {stats['calls']:>4}x {stats['total']:>8.3f}s "
+                  f"(max {stats['max']:.3f}s, {stats['memory'] / 1024:+,.0f} KiB)")
+
+        write("\n📦 Import time (self time per top-level package):")
+        packages = sorted(self.import_timer.by_package().items(), key=lambda item: -item[1])
+        for package, elapsed in packages[:TOP_N]:
+            write(f"  {package:<40} {elapsed:>8.3f}s")
+        if not packages:
+            write("  (no imports recorded)")
+
+        write("\n🧠 Context memory by section:")
+        sections = self.context_memory()
+        for key, entry in sorted(sections.items(), key=lambda item: -item[1]['bytes'] * item[1]['copies']):
+            write(f"  {key:<24} {entry['bytes']:>10,} bytes x {entry['copies']} "
+                  f"(duplicated {entry['duplicated']:,} bytes)")
+        if sections:
+            duplicated = sum(entry['duplicated'] for entry in sections.values())
+            write(f"  {'total duplicated':<24} {duplicated:>10,} bytes")
+        else:
+            write("  (no agents created)")
+
+        write("\n🤖 Context memory by agent:")
+        for agent_name, records in self.agent_context.items():
+            for i, record in enumerate(records, 1):
+                parts = ', '.join(f"{key} {size:,}" for key, size in record['sections'].items())
+                write(f"  {agent_name} #{i}: {record['prompt_bytes']:,} bytes ({parts or 'no context'})")
+
+        write("\n🔥 Top functions (cumulative time, all threads):")
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=buffer)
+        with self._lock:
+            thread_profiles = list(self._thread_profiles)
+        for profile in thread_profiles:
+            stats.add(profile)
+        stats.sort_stats('cumulative').print_stats(TOP_N)
+        for line in buffer.getvalue().splitlines():
+            if line.strip():
+                write(f"  {line}")
+
+        write("\n💾 Top allocations since start:")
+        for stat in allocations.compare_to(self._baseline_snapshot, 'lineno')[:TOP_N]:
+            write(f"  {stat}")
+
+        output = os.environ.get(PROFILE_OUTPUT_ENV_VAR)
+        if output:
+            stats.dump_stats(output)
+            write(f"\n📝 cProfile stats written to {output}")
+
+profiler = Profiler()
+
+# ============================================================================
+# HOOKS
+# ============================================================================
+
+def is_enabled(argv=None):
+    """Profiling is on when CREWAI_PROFILE is set or --profile is passed"""
+    argv = sys.argv if argv is None else argv
+    value = os.environ.get(PROFILE_ENV_VAR, '').strip().lower()
+    return value not in ('', '0', 'false', 'no') or PROFILE_FLAG in argv
+
+def enable():
+    """Turn profiling on for the rest of the process"""
+    profiler.enable()
+
+def section(name):
+    """Context manager timing a named section"""
+    return profiler.section(name)
+
+def profiled(name=None):
+    """Decorator timing every call of a function as a section"""
+    def decorator(func):
+        section_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.section(section_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+def record_agent_context(agent_name, context, prompt):
+    """Record the context sections embedded in an agent prompt"""
+    profiler.record_agent_context(agent_name, context, prompt)
+
+# Start as early as possible so imports done by the caller are timed
+if is_enabled():
+    enable()
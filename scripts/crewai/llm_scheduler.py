@@ -0,0 +1,442 @@
+"""
+LLM Request Scheduler for CrewAI Scripts
+
+Shared scheduler for outgoing LLM calls made by the crewai_config agents.
+Every call goes through:
+- token buckets for requests/minute and tokens/minute
+- jittered exponential backoff on rate-limit (429) errors and timeouts
+- a per-call timeout
+- a circuit breaker that stops calling a provider that keeps failing
+
+Limits come from environment variables (see SchedulerConfig.from_env) and
+the scheduler reports the throughput it achieved against them.
+
+Run `python llm_scheduler.py` for a demo against the local fake provider.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker is open and calls are rejected"""
+
+class CallTimeoutError(TimeoutError):
+    """Raised when a single call exceeds the per-call timeout"""
+
+class RetriesExhaustedError(RuntimeError):
+    """Raised when a call is still throttled after all retries"""
+
+_STATUS_429_PATTERN = re.compile(r'\b429\b')
+_RATE_LIMIT_PATTERN = re.compile(r'too many requests|rate[ _]limit', re.I)
+
+def is_rate_limit_error(error):
+    """
+    Detect provider rate-limit errors without depending on a provider SDK.
+    Only a 429 status, a *RateLimitError* class or a message naming both
+    429 and the rate limit count, so errors that merely contain the digits
+    (e.g. a context-length error about "142912 tokens") are not retried.
+    """
+    status = getattr(error, 'status_code', None) or getattr(error, 'status', None)
+    if status == 429:
+        return True
+    if 'ratelimit' in type(error).__name__.lower():
+        return True
+    message = str(error)
+    return bool(_STATUS_429_PATTERN.search(message) and _RATE_LIMIT_PATTERN.search(message))
+
+def retry_after(error):
+    """Server-provided retry delay in seconds, if the error carries one"""
+    value = getattr(error, 'retry_after', None)
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+@dataclass
+class SchedulerConfig:
+    requests_per_minute: int = 50
+    tokens_per_minute: int = 100000
+    max_retries: int = 6
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    timeout: float = 600.0
+    failure_threshold: int = 5
+    reset_timeout: float = 60.0
+    max_workers: int = 4
+    # Bucket capacity in seconds of quota; smaller values smooth out bursts.
+    # A full bucket allows this burst on top of the steady rate, so keep the
+    # configured limits slightly below the provider's.
+    burst_seconds: float = 10.0
+
+    @classmethod
+    def from_env(cls):
+        """Read limits from CREWAI_RPM, CREWAI_TPM, CREWAI_MAX_RETRIES and CREWAI_CALL_TIMEOUT"""
+        config = cls()
+        env = {
+            'CREWAI_RPM': ('requests_per_minute', int),
+            'CREWAI_TPM': ('tokens_per_minute', int),
+            'CREWAI_MAX_RETRIES': ('max_retries', int),
+            'CREWAI_CALL_TIMEOUT': ('timeout', float),
+        }
+        for name, (field, cast) in env.items():
+            if os.environ.get(name):
+                setattr(config, field, cast(os.environ[name]))
+        return config
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `per_minute`.
+    Requests larger than the capacity drain the bucket in several steps.
+    """
+
+    # Tokens this close to the requested amount count as available, so float
+    # rounding can't leave a waiter sleeping for sub-nanosecond delays forever
+    EPSILON = 1e-6
+    MIN_DELAY = 0.001
+
+    def __init__(self, per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        """Block until `amount` tokens have been taken. Returns the time waited."""
+        remaining = amount
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= remaining - self.EPSILON:
+                    self._tokens = max(0.0, self._tokens - remaining)
+                    return waited
+                if remaining > self.capacity:
+                    # Can never fit at once: take what is there and keep waiting
+                    remaining -= self._tokens
+                    self._tokens = 0.0
+                needed = min(remaining, self.capacity) - self._tokens
+                delay = max(self.MIN_DELAY, needed / self.rate)
+            self._sleep(delay)
+            waited += delay
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+class CircuitBreaker:
+    """
+    Opens after repeated failed calls and lets exactly one trial call
+    through after a cooldown. Rate limiting is not a failure: throttled
+    attempts are retried by the scheduler and never reach the breaker.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may be made now"""
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.reset_timeout - (self._clock() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(f"Circuit open, retry in {remaining:.1f}s")
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpenError("Circuit half-open, trial call in progress")
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class RequestScheduler:
+    """Rate-limits, retries and times out calls to an LLM provider"""
+
+    def __init__(self, config=None, clock=time.monotonic, sleep=time.sleep, rng=None):
+        self.config = config or SchedulerConfig()
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        burst = self.config.burst_seconds / 60.0
+        self.requests = TokenBucket(self.config.requests_per_minute,
+                                    capacity=max(1, self.config.requests_per_minute * burst),
+                                    clock=clock, sleep=sleep)
+        self.tokens = TokenBucket(self.config.tokens_per_minute,
+                                  capacity=max(1, self.config.tokens_per_minute * burst),
+                                  clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(self.config.failure_threshold, self.config.reset_timeout, clock=clock)
+        self._executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
+        self._lock = threading.Lock()
+        self._started = clock()
+        self.stats = {
+            'calls': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'throttled': 0,
+            'timeouts': 0,
+            'retries': 0,
+            'tokens': 0,
+            'waited': 0.0,
+        }
+
+    @property
+    def requests_per_minute(self):
+        return self.config.requests_per_minute
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def backoff_delay(self, attempt, error=None):
+        """Full-jitter exponential backoff, honouring a server retry-after"""
+        ceiling = min(self.config.max_delay, self.config.base_delay * (2 ** attempt))
+        delay = self._rng.uniform(0, ceiling)
+        server_delay = retry_after(error) if error is not None else None
+        return max(delay, server_delay) if server_delay is not None else delay
+
+    def _run(self, func, args, kwargs):
+        """
+        Run one attempt, giving up after the per-call timeout.
+
+        The timeout starts once a worker picks the attempt up. An attempt
+        still queued after the timeout is cancelled, so it never reaches the
+        provider after the caller gave up. A running thread can't be killed,
+        so a timed-out running attempt is abandoned and its result discarded;
+        callers should also pass the timeout to the provider client (as
+        ScheduledLLM does) so the request itself ends.
+        """
+        timeout = self.config.timeout
+        if not timeout:
+            return func(*args, **kwargs)
+
+        started = threading.Event()
+
+        def attempt():
+            started.set()
+            return func(*args, **kwargs)
+
+        future = self._executor.submit(attempt)
+        if not started.wait(timeout) and future.cancel():
+            raise CallTimeoutError(f"No free worker within the {timeout}s timeout")
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise CallTimeoutError(f"Call exceeded {timeout}s timeout")
+
+    def call(self, func, *args, estimated_tokens=1, **kwargs):
+        """
+        Call `func(*args, **kwargs)` within the configured limits.
+        `estimated_tokens` is charged against the tokens/minute bucket.
+        
+        Rate-limit errors and timeouts are retried with backoff. The circuit
+        breaker counts whole calls: only a call that finally fails (retries
+        exhausted or a non-retryable error) is recorded as a failure.
+        """
+        self._count('calls')
+        try:
+            self.breaker.allow()
+        except CircuitOpenError:
+            self._count('failed')
+            raise
+
+        last_error = None
+        for attempt in range(self.config.max_retries + 1):
+            waited = self.requests.acquire(1)
+            waited += self.tokens.acquire(estimated_tokens)
+            self._count('waited', waited)
+
+            try:
+                result = self._run(func, args, kwargs)
+            except CallTimeoutError as error:
+                self._count('timeouts')
+                last_error = error
+            except Exception as error:
+                if not is_rate_limit_error(error):
+                    self.breaker.record_failure()
+                    self._count('failed')
+                    raise
+                self._count('throttled')
+                last_error = error
+            else:
+                self.breaker.record_success()
+                self._count('succeeded')
+                self._count('tokens', estimated_tokens)
+                return result
+
+            if attempt < self.config.max_retries:
+                self._count('retries')
+                self._sleep(self.backoff_delay(attempt, last_error))
+
+        self.breaker.record_failure()
+        self._count('failed')
+        raise RetriesExhaustedError(
+            f"Gave up after {self.config.max_retries + 1} attempts: {last_error}"
+        ) from last_error
+
+    def throughput(self):
+        """Achieved requests/tokens per minute compared with the configured limits"""
+        elapsed_minutes = max(self._clock() - self._started, 1e-9) / 60.0
+        with self._lock:
+            stats = dict(self.stats)
+        attempts = stats['succeeded'] + stats['throttled'] + stats['timeouts']
+        return {
+            **stats,
+            'elapsed_seconds': elapsed_minutes * 60.0,
+            'requests_per_minute': attempts / elapsed_minutes,
+            'tokens_per_minute': stats['tokens'] / elapsed_minutes,
+            'requests_utilization': attempts / elapsed_minutes / self.config.requests_per_minute,
+            'tokens_utilization': stats['tokens'] / elapsed_minutes / self.config.tokens_per_minute,
+        }
+
+    def report(self):
+        """Print achieved throughput against the configured limits"""
+        stats = self.throughput()
+        print("📈 LLM Scheduler Throughput")
+        print(f"   Calls: {stats['calls']} ({stats['succeeded']} ok, {stats['failed']} failed)")
+        print(f"   Throttled: {stats['throttled']} | timeouts: {stats['timeouts']} | retries: {stats['retries']}")
+        print(f"   Requests/min: {stats['requests_per_minute']:.1f} of {self.config.requests_per_minute:g} "
+              f"({stats['requests_utilization']:.0%})")
+        print(f"   Tokens/min: {stats['tokens_per_minute']:,.0f} of {self.config.tokens_per_minute:,g} "
+              f"({stats['tokens_utilization']:.0%})")
+        print(f"   Waiting for capacity: {stats['waited']:.1f}s | circuit: {self.breaker.state}")
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """The process-wide scheduler shared by all crewai_config agents"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(SchedulerConfig.from_env())
+        return _scheduler
+
+# ============================================================================
+# FAKE PROVIDER
+# ============================================================================
+
+class FakeRateLimitError(Exception):
+    """429 error raised by FakeProvider"""
+
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests: rate limit exceeded")
+        self.retry_after = retry_after
+
+class FakeProvider:
+    """
+    Local stand-in for an LLM provider that enforces its own per-minute
+    limits over a sliding window and can inject extra throttling.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute=None, throttle_rate=0.0,
+                 latency=0.0, clock=time.monotonic, sleep=time.sleep, rng=None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.throttle_rate = throttle_rate
+        self.latency = latency
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random(0)
+        self._window = []
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+
+    def complete(self, prompt, tokens=1):
+        """Return a fake completion or raise FakeRateLimitError"""
+        with self._lock:
+            now = self._clock()
+            self._window = [(t, n) for t, n in self._window if now - t < 60.0]
+            used_tokens = sum(n for _, n in self._window)
+            over_requests = len(self._window) >= self.requests_per_minute
+            over_tokens = self.tokens_per_minute is not None and used_tokens + tokens > self.tokens_per_minute
+            injected = self._rng.random() < self.throttle_rate
+            if over_requests or over_tokens or injected:
+                self.rejected += 1
+                oldest = self._window[0][0] if self._window else now
+                raise FakeRateLimitError(retry_after=max(0.0, 60.0 - (now - oldest)) if not injected else None)
+            self._window.append((now, tokens))
+            self.accepted += 1
+        if self.latency:
+            self._sleep(self.latency)
+        return f"completion for: {prompt[:40]}"
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    print("🚦 LLM Scheduler demo against the fake provider")
+    print("=" * 60)
+
+    demo_config = SchedulerConfig(requests_per_minute=600, tokens_per_minute=60000,
+                                  base_delay=0.05, max_delay=1.0, timeout=5.0, burst_seconds=1.0)
+    scheduler = RequestScheduler(demo_config)
+    provider = FakeProvider(requests_per_minute=600, throttle_rate=0.1)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(scheduler.call, provider.complete, f"prompt {i}", 100, estimated_tokens=100)
+            for i in range(40)
+        ]
+        for future in futures:
+            future.result()
+
+    scheduler.report()
+    print(f"   Provider accepted {provider.accepted}, rejected {provider.rejected}")
+    sys.exit(0)
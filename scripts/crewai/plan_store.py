@@ -0,0 +1,345 @@
+"""
+Plan Store for Beautiful Timetracker App
+
+Content-addressed, compressed storage for CrewAI implementation plans.
+Plans are split into markdown sections; each section is stored once as a
+zlib-compressed blob named by its SHA-256, so boilerplate repeated across
+runs only takes space once. A JSON index keeps the metadata of every plan
+(issue id, timestamp, feature, context hash, tokens) for fast listing.
+
+Usage:
+    python plan_store.py import             # import implementations/*.md
+    python plan_store.py list [issue]       # list stored plans
+    python plan_store.py show <issue|plan>  # latest plan for an issue, or a plan by id
+    python plan_store.py stats              # storage statistics
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import zlib
+
+from context_snapshot import count_tokens
+
+# ============================================================================
+# PATHS
+# ============================================================================
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+IMPLEMENTATIONS_DIR = REPO_ROOT / 'implementations'
+STORE_DIR = IMPLEMENTATIONS_DIR / '.plan_store'
+
+INDEX_VERSION = 1
+COMPRESSION_LEVEL = 9
+# Shorter plan id prefixes could collide with issue numbers (ids are hex)
+MIN_PREFIX_LENGTH = 8
+LOCK_TIMEOUT = 30.0
+# A lock file older than this is assumed to be left over from a crashed writer
+STALE_LOCK_SECONDS = 120.0
+
+_HEADING_PATTERN = re.compile(r'^#{1,6} ')
+_FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+_ISSUE_PATTERN = re.compile(r'^issue_(.+)_plan\.md$')
+_GENERATED_PATTERN = re.compile(r'^\*\*Generated:\*\*\s*(\S+)', re.M)
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def content_hash(data):
+    """SHA-256 hex digest of a string or bytes"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def context_hash(context):
+    """Stable hash of a loaded project context dict"""
+    digest = hashlib.sha256()
+    for key in sorted(context):
+        digest.update(key.encode('utf-8') + b'\0')
+        digest.update(str(context[key]).encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+def split_sections(markdown):
+    """
+    Split markdown into sections starting at each heading.
+    Headings inside fenced code blocks are ignored, and joining the
+    sections gives back the original text.
+    """
+    sections = []
+    current = []
+    in_fence = False
+    for line in markdown.splitlines(keepends=True):
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence and _HEADING_PATTERN.match(line) and current:
+            sections.append(''.join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append(''.join(current))
+    return sections
+
+def extract_feature(markdown):
+    """Best-effort feature summary: the first line after a 'User Story' heading"""
+    lines = markdown.splitlines()
+    for i, line in enumerate(lines):
+        if _HEADING_PATTERN.match(line) and 'user story' in line.lower():
+            for candidate in lines[i + 1:]:
+                candidate = candidate.strip()
+                if candidate and not _HEADING_PATTERN.match(candidate):
+                    return candidate[:200]
+            break
+    return ''
+
+def render_plan_markdown(issue_id, result, timestamp=None):
+    """Render crew output in the implementations/issue_<n>_plan.md layout"""
+    timestamp = timestamp or datetime.now().isoformat()
+    return (
+        f"# Implementation Plan for Issue #{issue_id}\n\n"
+        f"**Generated:** {timestamp}\n\n"
+        f"## Full Crew Output\n\n"
+        f"{result}\n"
+    )
+
+# ============================================================================
+# PLAN STORE
+# ============================================================================
+
+class PlanStore:
+    """Deduplicated, compressed plan storage with a metadata index"""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.index_path = self.root / 'index.json'
+        self.lock_path = self.root / 'index.lock'
+        self._plans = None
+        self._by_issue = None
+
+    # --- index ------------------------------------------------------------
+
+    def _load_index(self):
+        if self._plans is not None:
+            return
+        if self.index_path.exists():
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+            plans = data.get('plans', [])
+        else:
+            plans = []
+        self._plans = {plan['id']: plan for plan in plans}
+        self._by_issue = {}
+        for plan in plans:
+            self._by_issue.setdefault(plan['issue'], []).append(plan['id'])
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the store's lock file so concurrent writers (in other processes
+        too) don't overwrite each other's index updates.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - self.lock_path.stat().st_mtime > STALE_LOCK_SECONDS:
+                        self.lock_path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Plan store is locked: {self.lock_path}")
+                time.sleep(0.05)
+        try:
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            os.close(fd)
+            yield
+        finally:
+            try:
+                self.lock_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _write_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        data = {'version': INDEX_VERSION, 'plans': list(self._plans.values())}
+        tmp_path = self.index_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        tmp_path.replace(self.index_path)
+
+    # --- blobs ------------------------------------------------------------
+
+    def _blob_path(self, digest):
+        return self.blob_dir / digest[:2] / f"{digest}.z"
+
+    def _put_blob(self, text):
+        digest = content_hash(text)
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp_path.write_bytes(zlib.compress(text.encode('utf-8'), COMPRESSION_LEVEL))
+            tmp_path.replace(path)
+        return digest
+
+    def _get_blob(self, digest):
+        return zlib.decompress(self._blob_path(digest).read_bytes()).decode('utf-8')
+
+    # --- public API -------------------------------------------------------
+
+    def save(self, markdown, issue_id, feature='', context_hash='', timestamp=None):
+        """
+        Store a plan and return its index entry.
+        Saving identical markdown for the same issue returns the existing entry.
+        """
+        issue_id = str(issue_id)
+        plan_id = content_hash(f"{issue_id}\0{markdown}")[:16]
+
+        with self._locked():
+            # Re-read under the lock to pick up plans saved by other writers
+            self._plans = None
+            self._load_index()
+            if plan_id in self._plans:
+                return self._plans[plan_id]
+
+            sections = [self._put_blob(section) for section in split_sections(markdown)]
+            entry = {
+                'id': plan_id,
+                'issue': issue_id,
+                'timestamp': timestamp or datetime.now().isoformat(),
+                'feature': feature or extract_feature(markdown),
+                'context_hash': context_hash,
+                'tokens': count_tokens(markdown),
+                'size': len(markdown.encode('utf-8')),
+                'sections': sections,
+            }
+            self._plans[plan_id] = entry
+            self._by_issue.setdefault(issue_id, []).append(plan_id)
+            self._write_index()
+        return entry
+
+    def list(self, issue_id=None, feature=None):
+        """Index entries, newest first, optionally filtered by issue or feature text"""
+        self._load_index()
+        if issue_id is not None:
+            plans = [self._plans[plan_id] for plan_id in self._by_issue.get(str(issue_id), [])]
+        else:
+            plans = list(self._plans.values())
+        if feature:
+            needle = feature.lower()
+            plans = [plan for plan in plans if needle in plan['feature'].lower()]
+        return sorted(plans, key=lambda plan: plan['timestamp'], reverse=True)
+
+    def get(self, plan_id):
+        """Index entry for a plan id (or unique id prefix of 8+ characters), or None"""
+        self._load_index()
+        if plan_id in self._plans:
+            return self._plans[plan_id]
+        if len(plan_id) < MIN_PREFIX_LENGTH:
+            return None
+        matches = [plan for key, plan in self._plans.items() if key.startswith(plan_id)]
+        return matches[0] if len(matches) == 1 else None
+
+    def latest(self, issue_id):
+        """Newest plan entry for an issue, or None"""
+        plans = self.list(issue_id)
+        return plans[0] if plans else None
+
+    def render(self, plan_id):
+        """Rebuild a plan's markdown from its section blobs"""
+        entry = self.get(plan_id)
+        if entry is None:
+            raise KeyError(f"Unknown plan: {plan_id}")
+        return ''.join(self._get_blob(digest) for digest in entry['sections'])
+
+    def import_directory(self, directory=IMPLEMENTATIONS_DIR):
+        """Import every issue_<n>_plan.md file in `directory`"""
+        imported = []
+        for path in sorted(Path(directory).glob('issue_*_plan.md')):
+            match = _ISSUE_PATTERN.search(path.name)
+            if not match:
+                continue
+            markdown = path.read_text(encoding='utf-8')
+            generated = _GENERATED_PATTERN.search(markdown)
+            timestamp = generated.group(1) if generated else datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+            imported.append(self.save(markdown, match.group(1), timestamp=timestamp))
+        return imported
+
+    def stats(self):
+        """Logical plan size vs. compressed bytes on disk"""
+        self._load_index()
+        blobs = list(self.blob_dir.glob('*/*.z')) if self.blob_dir.exists() else []
+        return {
+            'plans': len(self._plans),
+            'issues': len(self._by_issue),
+            'sections': sum(len(plan['sections']) for plan in self._plans.values()),
+            'unique_sections': len(blobs),
+            'logical_bytes': sum(plan['size'] for plan in self._plans.values()),
+            'stored_bytes': sum(path.stat().st_size for path in blobs),
+        }
+
+def save_plan(issue_id, result, feature='', context=None):
+    """Render crew output as a plan and store it. Returns the index entry."""
+    timestamp = datetime.now().isoformat()
+    markdown = render_plan_markdown(issue_id, result, timestamp)
+    return PlanStore().save(
+        markdown,
+        issue_id,
+        feature=feature,
+        context_hash=context_hash(context) if context else '',
+        timestamp=timestamp,
+    )
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    """Command line interface for the plan store"""
+    store = PlanStore()
+    command = argv[1] if len(argv) > 1 else 'list'
+
+    if command == 'import':
+        directory = Path(argv[2]) if len(argv) > 2 else IMPLEMENTATIONS_DIR
+        imported = store.import_directory(directory)
+        print(f"✅ Imported {len(imported)} plan(s) from {directory}")
+        return 0
+
+    if command == 'list':
+        issue_id = argv[2] if len(argv) > 2 else None
+        for plan in store.list(issue_id):
+            print(f"{plan['id']}  #{plan['issue']:<6} {plan['timestamp'][:19]}  "
+                  f"{plan['tokens']:>6,} tokens  {plan['feature'][:60]}")
+        return 0
+
+    if command == 'show' and len(argv) > 2:
+        # Issue numbers first: they are digits and would match hex plan ids
+        entry = store.latest(argv[2]) or store.get(argv[2])
+        if entry is None:
+            print(f"❌ No plan found for {argv[2]}")
+            return 1
+        print(store.render(entry['id']), end='')
+        return 0
+
+    if command == 'stats':
+        stats = store.stats()
+        print(f"📦 {stats['plans']} plan(s) for {stats['issues']} issue(s)")
+        print(f"   Sections: {stats['sections']} ({stats['unique_sections']} unique)")
+        print(f"   Size: {stats['logical_bytes']:,} bytes -> {stats['stored_bytes']:,} bytes stored")
+        return 0
+
+    print("Usage: python plan_store.py [import [dir] | list [issue] | show <issue|plan> | stats]")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
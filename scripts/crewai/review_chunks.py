@@ -0,0 +1,162 @@
+"""
+Review Chunking Helpers for CrewAI Scripts
+
+Splits generated output into per-file / per-hunk chunks for concurrent
+review and merges the per-chunk findings into one deduplicated report.
+Used by crewai_config.review_code; nothing here depends on crewai.
+"""
+
+import re
+
+# Largest chunk (in characters) handed to a single reviewer call
+REVIEW_CHUNK_MAX_CHARS = 12000
+
+# '- ', '* ', '+ ' and numbered ('1.', '1)') list items
+_BULLET_PATTERN = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+(.*\S)')
+
+# ============================================================================
+# SPLITTING
+# ============================================================================
+
+def _split_long_chunk(label, content, max_chars):
+    """Split an oversized chunk on line boundaries"""
+    if len(content) <= max_chars:
+        return [{'label': label, 'content': content}]
+    
+    parts = []
+    current = []
+    size = 0
+    for line in content.splitlines(keepends=True):
+        if current and size + len(line) > max_chars:
+            parts.append(''.join(current))
+            current = []
+            size = 0
+        current.append(line)
+        size += len(line)
+    if current:
+        parts.append(''.join(current))
+    
+    return [
+        {'label': f"{label} (part {i}/{len(parts)})", 'content': part}
+        for i, part in enumerate(parts, 1)
+    ]
+
+def _split_diff(code, max_chars):
+    """Split a unified diff into per-file chunks, and per-hunk when a file is too large"""
+    files = re.split(r'(?m)^(?=diff --git )', code)
+    chunks = []
+    for section in files:
+        if not section.strip():
+            continue
+        match = re.search(r'(?m)^\+\+\+ (?:b/)?(\S+)', section)
+        label = match.group(1) if match else 'diff'
+        if len(section) <= max_chars:
+            chunks.append({'label': label, 'content': section})
+            continue
+        
+        # Keep the file header with every hunk so each chunk stands on its own
+        pieces = re.split(r'(?m)^(?=@@ )', section)
+        header, hunks = pieces[0], pieces[1:]
+        if not hunks:
+            # Binary, rename or mode-only changes have no hunks to split on
+            chunks.extend(_split_long_chunk(label, section, max_chars))
+            continue
+        for i, hunk in enumerate(hunks, 1):
+            chunks.extend(_split_long_chunk(f"{label} hunk {i}", header + hunk, max_chars))
+    return chunks
+
+def _split_fenced_blocks(code, max_chars):
+    """
+    Split markdown output into one chunk per fenced code block.
+    Prose before a block stays with that block; prose after the last block
+    (e.g. the integration explanation) becomes an 'explanation' chunk.
+    """
+    chunks = []
+    pattern = re.compile(r'```([\w.+-]*)[^\n]*\n(.*?)```', re.S)
+    last_end = 0
+    for i, match in enumerate(pattern.finditer(code), 1):
+        # Label the block with the nearest file name mentioned just before it
+        preceding = code[last_end:match.start()]
+        names = re.findall(r'[\w./-]+\.(?:js|html|css|json|md)\b', preceding)
+        label = names[-1] if names else f"{match.group(1) or 'code'} block {i}"
+        content = preceding.lstrip('\n') + match.group(0)
+        chunks.extend(_split_long_chunk(label, content, max_chars))
+        last_end = match.end()
+    trailing = code[last_end:]
+    if chunks and trailing.strip():
+        chunks.extend(_split_long_chunk('explanation', trailing.strip('\n'), max_chars))
+    return chunks
+
+def split_review_chunks(code_to_review, max_chars=REVIEW_CHUNK_MAX_CHARS):
+    """
+    Split generated output into reviewable chunks.
+    
+    Unified diffs are split per file (and per hunk for large files), markdown
+    output is split per fenced code block. Anything else falls back to
+    line-based splitting. Returns a list of {'label', 'content'} dicts.
+    """
+    code = str(code_to_review)
+    
+    if re.search(r'(?m)^diff --git ', code):
+        chunks = _split_diff(code, max_chars)
+    elif '```' in code:
+        chunks = _split_fenced_blocks(code, max_chars)
+    else:
+        chunks = []
+    
+    if not chunks:
+        chunks = _split_long_chunk('output', code, max_chars)
+    
+    return chunks
+
+# ============================================================================
+# MERGING
+# ============================================================================
+
+def _normalize_finding(text):
+    """Normalize a finding for deduplication"""
+    text = re.sub(r'[^\w\s]', '', text.lower())
+    return ' '.join(text.split())
+
+def merge_review_findings(results):
+    """
+    Merge per-chunk review results into one deduplicated markdown report.
+    
+    `results` is a list of (label, review_text) tuples. List items ("- ",
+    "* " or "1.") count as findings; headings and prose around them are
+    ignored. Identical findings reported for several chunks are listed once
+    with every chunk they apply to. A review without any list items is
+    included verbatim under its label, so its findings are never dropped.
+    """
+    findings = {}
+    order = []
+    unstructured = []
+    for label, text in results:
+        found = False
+        for line in str(text).splitlines():
+            match = _BULLET_PATTERN.match(line)
+            if not match:
+                continue
+            key = _normalize_finding(match.group(1))
+            if not key:
+                continue
+            found = True
+            if key not in findings:
+                findings[key] = {'text': match.group(1), 'labels': []}
+                order.append(key)
+            if label not in findings[key]['labels']:
+                findings[key]['labels'].append(label)
+        if not found and str(text).strip():
+            unstructured.append((label, str(text).strip()))
+    
+    lines = ["## Code Review Report", ""]
+    lines.append(f"Reviewed {len(results)} chunk(s): {', '.join(label for label, _ in results)}")
+    lines.append("")
+    for key in order:
+        finding = findings[key]
+        lines.append(f"- {finding['text']} ({', '.join(finding['labels'])})")
+    
+    for label, text in unstructured:
+        lines.extend(["", f"### {label} (review not in list form)", "", text])
+    
+    return '\n'.join(lines)
@@ -4,29 +4,32 @@ CrewAI Setup Verification Script
 
 This script verifies that CrewAI is properly configured for this project.
 Run this before using CrewAI to ensure everything is set up correctly.
+
+Pass --profile (or set CREWAI_PROFILE=1) to print a profiling report on exit.
 """
 
 import sys
 from pathlib import Path
 
+from crewai_profiling import profiled
+
+@profiled()
 def check_files():
     """Check that all required files exist"""
     print("📁 Checking required files...")
     
+    script_dir = Path(__file__).parent
     required_files = {
         'Configuration': 'crewai_config.py',
         'Usage Examples': 'crewai_usage.py',
         'Requirements': 'requirements.txt',
         'Main README': 'CREWAI_README.md',
-        'Project Context': 'docs/PROJECT_CONTEXT.md',
-        'HTML': 'index.html',
-        'JavaScript': 'app.js',
-        'CSS': 'styles.css',
+        'Context Manifest': 'context_manifest.json',
     }
     
     all_good = True
     for name, filepath in required_files.items():
-        path = Path(filepath)
+        path = script_dir / filepath
         if path.exists():
             size = path.stat().st_size
             print(f"  ✅ {name}: {filepath} ({size:,} bytes)")
@@ -34,8 +37,24 @@ def check_files():
             print(f"  ❌ {name}: {filepath} - MISSING!")
             all_good = False
     
+    try:
+        from context_registry import ContextSourceError, get_registry
+        files = get_registry(script_dir / 'context_manifest.json').files()
+    except ContextSourceError as e:
+        for key, problem in e.problems.items():
+            print(f"  ❌ Context '{key}': {problem}")
+        return False
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # Unreadable or malformed context_manifest.json (JSONDecodeError is a ValueError)
+        print(f"  ❌ Context Manifest: invalid context_manifest.json - {type(e).__name__}: {e}")
+        return False
+    
+    for filepath, path in files.items():
+        print(f"  ✅ Context: {filepath} ({path.stat().st_size:,} bytes)")
+    
     return all_good
 
+@profiled()
 def check_context_files():
     """Check that context files can be loaded"""
     print("\n📚 Checking context file loading...")
@@ -64,6 +83,7 @@ def check_context_files():
         print(f"  ❌ Error loading context: {e}")
         return False
 
+@profiled()
 def check_agents():
     """Check that agents can be created"""
     print("\n🤖 Checking agent creation...")
@@ -85,6 +105,7 @@ def check_agents():
         traceback.print_exc()
         return False
 
+@profiled()
 def check_dependencies():
     """Check if required Python packages are installed"""
     print("\n📦 Checking Python dependencies...")
@@ -110,6 +131,7 @@ def check_dependencies():
     
     return all_good
 
+@profiled()
 def check_env_file():
     """Check if .env file exists"""
     print("\n🔐 Checking environment setup...")
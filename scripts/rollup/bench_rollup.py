@@ -0,0 +1,96 @@
+"""
+Benchmark: rollup index vs. full rescan
+
+Generates synthetic time entries (several per day over a few years),
+then compares:
+- today's summary (what updateTodaySummary computes) by rescanning every
+  entry vs. reading the day bucket
+- a long range summary by rescan vs. the rollup buckets
+- ingesting an export with one new entry vs. rebuilding the index from scratch
+
+Usage:
+    python bench_rollup.py [years] [entries_per_day]
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+
+from time_rollup import RollupIndex, rescan_summary
+
+PROJECTS = ['Website', 'Backend', 'Meetings', 'Research', 'Support', 'Admin']
+
+def generate_entries(years, per_day, end=None, seed=0):
+    """Synthetic entries in the app's format, newest first like timeEntries"""
+    rng = random.Random(seed)
+    end = end or date.today()
+    day = end - timedelta(days=365 * years)
+    entry_id = 1_600_000_000_000
+    entries = []
+    while day <= end:
+        for _ in range(per_day):
+            entry_id += 1
+            entries.append({
+                'id': entry_id,
+                'project': rng.choice(PROJECTS),
+                'duration': rng.randint(60_000, 4 * 3_600_000),
+                'date': day.isoformat(),
+            })
+        day += timedelta(days=1)
+    entries.reverse()
+    return entries
+
+def best_of(func, repeat=5):
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main(argv):
+    years = int(argv[1]) if len(argv) > 1 else 5
+    per_day = int(argv[2]) if len(argv) > 2 else 8
+    today = date.today()
+
+    entries = generate_entries(years, per_day, today)
+    print(f"⏱️  Rollup benchmark: {len(entries):,} entries over {years} years")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / 'rollup.index.jsonl'
+        build_ms = best_of(lambda: (index_path.unlink(missing_ok=True), RollupIndex(index_path).ingest(entries)), 3)
+        index = RollupIndex(index_path)
+
+        range_start = today - timedelta(days=365 * years // 2)
+        assert index.summary(today) == rescan_summary(entries, today)
+        assert index.summary(range_start, today) == rescan_summary(entries, range_start, today)
+
+        rows = [
+            ("Today's summary (rescan)", best_of(lambda: rescan_summary(entries, today))),
+            ("Today's summary (rollup)", best_of(lambda: index.summary(today))),
+            ("Range summary (rescan)", best_of(lambda: rescan_summary(entries, range_start, today))),
+            ("Range summary (rollup)", best_of(lambda: index.summary(range_start, today))),
+            ("Full index build", build_ms),
+        ]
+
+        next_id = max(entry['id'] for entry in entries)
+        def add_entry():
+            # The app exports every entry, newest first
+            nonlocal next_id
+            next_id += 1
+            entries.insert(0, {'id': next_id, 'project': 'Website', 'duration': 60_000, 'date': today.isoformat()})
+            assert index.ingest(entries) == 1
+        rows.append(("Incremental ingest (1 new entry)", best_of(add_entry)))
+        rows.append(("Reload index from file", best_of(lambda: RollupIndex(index_path), 3)))
+
+    for label, ms in rows:
+        print(f"  {label:<32} {ms:>10.3f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,313 @@
+"""
+Time Entry Rollup Index for Beautiful Timetracker App
+
+Builds per-project daily, weekly and monthly totals from a time-entry
+export (the `timeEntries` array the app keeps in localStorage) and keeps
+them in an append-friendly index file. Ingesting new entries only appends
+the changed buckets, and summaries over any date range are answered from
+the buckets instead of rescanning every entry.
+
+The app also deletes entries and renames them to 'Deleted Project', so each
+ingest checks a fingerprint of the already-ingested entries (ids up to the
+watermark) against the export and rebuilds the index when they differ.
+Entries without an id cannot be tracked and are skipped.
+
+Index file format (JSON lines):
+    {"version": 1}                                   header
+    {"max_id": 1700000000000, "count": 120,
+     "fingerprint": "9f3c...", "buckets": [...]}     one line per ingest
+
+Each bucket delta is [granularity, bucket, project, duration_ms, count].
+Replaying the lines gives the current totals; `compact` rewrites the file
+with one line holding the merged buckets.
+
+Usage:
+    python time_rollup.py ingest export.json
+    python time_rollup.py summary 2026-01-01 2026-10-19
+    python time_rollup.py compact
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import hashlib
+import json
+import sys
+
+INDEX_VERSION = 1
+FINGERPRINT_MASK = (1 << 64) - 1
+DEFAULT_INDEX = Path(__file__).parent / 'time_rollup.index.jsonl'
+
+DAY = 'day'
+WEEK = 'week'
+MONTH = 'month'
+GRANULARITIES = (DAY, WEEK, MONTH)
+
+# ============================================================================
+# BUCKET KEYS
+# ============================================================================
+
+def entry_date(entry):
+    """Date of an entry, from its 'date' field or its start time (UTC, like the app)"""
+    if entry.get('date'):
+        return date.fromisoformat(entry['date'])
+    return datetime.fromtimestamp(entry['startTime'] / 1000, tz=timezone.utc).date()
+
+def day_key(day):
+    return day.isoformat()
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def month_key(day):
+    return f"{day.year}-{day.month:02d}"
+
+def bucket_keys(day):
+    """(granularity, bucket) pairs an entry on `day` contributes to"""
+    return ((DAY, day_key(day)), (WEEK, week_key(day)), (MONTH, month_key(day)))
+
+def _next_month(day):
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+def range_buckets(start, end):
+    """
+    Cover the inclusive range [start, end] with the fewest buckets:
+    whole months where possible, then whole ISO weeks, then single days.
+    """
+    buckets = []
+    day = start
+    while day <= end:
+        if day.day == 1 and _next_month(day) - timedelta(days=1) <= end:
+            buckets.append((MONTH, month_key(day)))
+            day = _next_month(day)
+        elif day.weekday() == 0 and day + timedelta(days=6) <= end:
+            buckets.append((WEEK, week_key(day)))
+            day += timedelta(days=7)
+        else:
+            buckets.append((DAY, day_key(day)))
+            day += timedelta(days=1)
+    return buckets
+
+def entry_fingerprint(entry):
+    """64-bit hash of the fields a summary depends on"""
+    key = f"{entry['id']}\0{entry['project']}\0{entry['duration']}\0{entry.get('date') or entry['startTime']}"
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def entries_fingerprint(entries):
+    """Order-independent fingerprint of a set of entries (sum of entry hashes)"""
+    return sum(entry_fingerprint(entry) for entry in entries) & FINGERPRINT_MASK
+
+# ============================================================================
+# EXPORT LOADING
+# ============================================================================
+
+def load_export(path):
+    """
+    Read time entries from a JSON export: either the raw `timeEntries`
+    array, an object with a "timeEntries" key, or one entry per line.
+    """
+    text = Path(path).read_text(encoding='utf-8').strip()
+    if not text:
+        return []
+    if text[0] in '[{':
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict) and 'timeEntries' in data:
+            return data['timeEntries']
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+# ============================================================================
+# ROLLUP INDEX
+# ============================================================================
+
+class RollupIndex:
+    """Incremental per-project day/week/month totals backed by an index file"""
+
+    def __init__(self, path=DEFAULT_INDEX):
+        self.path = Path(path)
+        self._reset()
+        if self.path.exists():
+            self._replay()
+
+    def _reset(self):
+        # buckets[granularity][bucket][project] = [duration_ms, count]
+        self.buckets = {granularity: {} for granularity in GRANULARITIES}
+        self.max_id = None
+        # Number and fingerprint of the entries ingested so far
+        self.count = 0
+        self.fingerprint = 0
+
+    def _apply(self, granularity, bucket, project, duration, count):
+        totals = self.buckets[granularity].setdefault(bucket, {}).setdefault(project, [0, 0])
+        totals[0] += duration
+        totals[1] += count
+
+    def _replay(self):
+        with open(self.path, encoding='utf-8') as f:
+            header = json.loads(f.readline() or '{}')
+            if header.get('version') != INDEX_VERSION:
+                raise ValueError(f"Unsupported rollup index: {self.path}")
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                for delta in record['buckets']:
+                    self._apply(*delta)
+                if record.get('max_id') is not None:
+                    self.max_id = max(self.max_id or 0, record['max_id'])
+                self.count = record.get('count')
+                # Missing in older files: forces a rebuild on the next ingest
+                fingerprint = record.get('fingerprint')
+                self.fingerprint = int(fingerprint, 16) if fingerprint is not None else None
+
+    def _append(self, record):
+        new_file = not self.path.exists()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if new_file:
+                f.write(json.dumps({'version': INDEX_VERSION}) + '\n')
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def ingest(self, entries):
+        """
+        Add entries newer than the last ingested id (entry ids are creation
+        timestamps). Only the affected buckets are updated and appended.
+
+        `entries` is the full export: if the already-ingested entries were
+        deleted or changed since the last ingest, the index is rebuilt from
+        it. Entries without an id are skipped. Returns the number of entries
+        added (all of them after a rebuild).
+        """
+        entries = [entry for entry in entries if entry.get('id') is not None]
+        if self.max_id is not None:
+            known = [entry for entry in entries if entry['id'] <= self.max_id]
+            if len(known) != self.count or entries_fingerprint(known) != self.fingerprint:
+                return self.rebuild(entries)
+
+        deltas = {}
+        max_id = self.max_id
+        added = []
+        for entry in entries:
+            if self.max_id is not None and entry['id'] <= self.max_id:
+                continue
+            for granularity, bucket in bucket_keys(entry_date(entry)):
+                totals = deltas.setdefault((granularity, bucket, entry['project']), [0, 0])
+                totals[0] += entry['duration']
+                totals[1] += 1
+            max_id = entry['id'] if max_id is None else max(max_id, entry['id'])
+            added.append(entry)
+
+        if not added:
+            return 0
+
+        for key, (duration, count) in deltas.items():
+            self._apply(*key, duration, count)
+        self.max_id = max_id
+        self.count += len(added)
+        self.fingerprint = (self.fingerprint + entries_fingerprint(added)) & FINGERPRINT_MASK
+        self._append({
+            'max_id': max_id,
+            'count': self.count,
+            'fingerprint': f"{self.fingerprint:016x}",
+            'buckets': [[*key, duration, count] for key, (duration, count) in deltas.items()],
+        })
+        return len(added)
+
+    def rebuild(self, entries):
+        """Discard the index and ingest `entries` from scratch"""
+        self._reset()
+        self.path.unlink(missing_ok=True)
+        return self.ingest(entries)
+
+    def compact(self):
+        """Rewrite the index file as a single line of merged buckets"""
+        record = {
+            'max_id': self.max_id,
+            'count': self.count,
+            'fingerprint': f"{self.fingerprint:016x}" if self.fingerprint is not None else None,
+            'buckets': [
+                [granularity, bucket, project, duration, count]
+                for granularity, buckets in self.buckets.items()
+                for bucket, projects in buckets.items()
+                for project, (duration, count) in projects.items()
+            ],
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'version': INDEX_VERSION}) + '\n')
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        tmp_path.replace(self.path)
+
+    def bucket(self, granularity, key):
+        """Per-project {project: duration_ms} for one bucket"""
+        projects = self.buckets[granularity].get(key, {})
+        return {project: totals[0] for project, totals in projects.items()}
+
+    def summary(self, start, end=None):
+        """
+        Per-project {project: duration_ms} for the inclusive date range.
+        Runs in O(buckets covering the range), independent of entry count.
+        """
+        end = end or start
+        result = {}
+        for granularity, key in range_buckets(start, end):
+            for project, (duration, _) in self.buckets[granularity].get(key, {}).items():
+                result[project] = result.get(project, 0) + duration
+        return result
+
+def rescan_summary(entries, start, end=None):
+    """Reference summary computed by scanning every entry (what the app does today)"""
+    end = end or start
+    result = {}
+    for entry in entries:
+        if start <= entry_date(entry) <= end:
+            result[entry['project']] = result.get(entry['project'], 0) + entry['duration']
+    return result
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def format_duration(ms):
+    """HH:MM:SS like the app's summary cards"""
+    seconds = ms // 1000
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def main(argv):
+    """Command line interface for the rollup index"""
+    command = argv[1] if len(argv) > 1 else ''
+    index = RollupIndex()
+
+    if command == 'ingest' and len(argv) > 2:
+        entries = load_export(argv[2])
+        added = index.ingest(entries)
+        print(f"✅ Ingested {added} new entr{'y' if added == 1 else 'ies'} into {index.path}")
+        skipped = sum(1 for entry in entries if entry.get('id') is None)
+        if skipped:
+            print(f"⚠️  Skipped {skipped} entr{'y' if skipped == 1 else 'ies'} without an id")
+        return 0
+
+    if command == 'summary':
+        start = date.fromisoformat(argv[2]) if len(argv) > 2 else date.today()
+        end = date.fromisoformat(argv[3]) if len(argv) > 3 else start
+        totals = index.summary(start, end)
+        print(f"📊 {start} – {end}")
+        if not totals:
+            print("   No time entries")
+        for project, duration in sorted(totals.items(), key=lambda item: -item[1]):
+            print(f"   {project:<30} {format_duration(duration)}")
+        return 0
+
+    if command == 'compact':
+        index.compact()
+        print(f"✅ Compacted {index.path}")
+        return 0
+
+    print("Usage: python time_rollup.py [ingest <export.json> | summary [start] [end] | compact]")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,59 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'crewai'))
+
+from context_registry import ContextLoader, ContextRegistry, ContextSourceError  # noqa: E402
+
+
+class ContextRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / 'docs').mkdir()
+        (self.root / 'public' / 'js').mkdir(parents=True)
+        (self.root / 'docs' / 'CONTEXT.md').write_text('# Context\n')
+        (self.root / 'public' / 'app.js').write_text('const a = 1;\n')
+        (self.root / 'public' / 'js' / 'util.js').write_text('const b = 2;\n')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def registry(self, sources):
+        return ContextRegistry({'sources': sources}, root=self.root, loader=ContextLoader())
+
+    def test_loads_plain_paths_and_globs(self):
+        context = self.registry({'docs': 'docs/CONTEXT.md', 'js': 'public/**'}).load()
+        self.assertEqual(context['docs'], '# Context\n')
+        self.assertIn('--- public/app.js ---\nconst a = 1;', context['js'])
+        self.assertIn('--- public/js/util.js ---\nconst b = 2;', context['js'])
+
+    def test_glob_sources_always_get_file_headers(self):
+        context = self.registry({'js': 'public/js/*.js'}).load()
+        self.assertEqual(context['js'], '--- public/js/util.js ---\nconst b = 2;\n')
+
+    def test_missing_source_fails_fast(self):
+        registry = self.registry({'docs': 'docs/CONTEXT.md', 'css': 'public/**/*.css'})
+        with self.assertRaises(ContextSourceError) as error:
+            registry.load()
+        self.assertEqual(list(error.exception.problems), ['css'])
+
+    def test_empty_source_fails_fast_unless_optional(self):
+        (self.root / 'docs' / 'EMPTY.md').write_text('  \n')
+        with self.assertRaises(ContextSourceError):
+            self.registry({'empty': 'docs/EMPTY.md'}).load()
+        context = self.registry({'empty': {'path': 'docs/EMPTY.md', 'optional': True}}).load()
+        self.assertEqual(context['empty'].strip(), '')
+
+    def test_loader_cache_is_invalidated_on_change(self):
+        loader = ContextLoader()
+        path = self.root / 'docs' / 'CONTEXT.md'
+        self.assertEqual(loader.read(path), '# Context\n')
+        path.write_text('# Changed context\n')
+        self.assertEqual(loader.read(path), '# Changed context\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'crewai'))
+
+from context_snapshot import MAGIC, build_snapshot, load_snapshot, normalize_text  # noqa: E402
+
+
+class ContextSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.source = self.root / 'app.js'
+        self.source.write_text('const a = 1;  \r\n\r\nfunction run() {}\n')
+        self.sources = {'app.js': self.source}
+        self.snapshot_path = self.root / 'snapshot.bin'
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        build_snapshot(self.sources, self.snapshot_path)
+        with load_snapshot(self.sources, self.snapshot_path) as snapshot:
+            self.assertEqual(snapshot.text('app.js'), normalize_text(self.source.read_text()))
+            self.assertEqual(''.join(snapshot.chunks('app.js')), snapshot.text('app.js'))
+            self.assertEqual(snapshot.search('function run')[0][0], 'app.js')
+
+    def test_index_is_parsed_on_first_search_only(self):
+        build_snapshot(self.sources, self.snapshot_path)
+        with load_snapshot(self.sources, self.snapshot_path) as snapshot:
+            snapshot.text('app.js')
+            self.assertIsNone(snapshot._index)
+            snapshot.search('run')
+            self.assertIsNotNone(snapshot._index)
+
+    def test_changed_source_makes_snapshot_stale(self):
+        build_snapshot(self.sources, self.snapshot_path)
+        self.source.write_text('const a = 2;\n')
+        self.assertIsNone(load_snapshot(self.sources, self.snapshot_path))
+
+    def test_corrupt_snapshots_are_ignored(self):
+        build_snapshot(self.sources, self.snapshot_path)
+        valid = self.snapshot_path.read_bytes()
+        for content in [
+            MAGIC,
+            MAGIC + struct.pack('<I', 9999) + b'{}',
+            MAGIC + struct.pack('<I', 3) + b'{x}',
+            MAGIC + struct.pack('<I', 2) + b'{}',
+            MAGIC + struct.pack('<I', 33) + b'{"format_version":1,"sources":{}}',
+            valid[:-5],
+        ]:
+            self.snapshot_path.write_bytes(content)
+            self.assertIsNone(load_snapshot(self.sources, self.snapshot_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import random
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'crewai'))
+
+from llm_scheduler import (  # noqa: E402
+    CircuitBreaker,
+    CircuitOpenError,
+    FakeProvider,
+    RequestScheduler,
+    RetriesExhaustedError,
+    SchedulerConfig,
+    TokenBucket,
+    is_rate_limit_error,
+)
+
+
+class FakeClock:
+    """Deterministic clock; sleeping just advances time"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler(clock, **overrides):
+    config = SchedulerConfig(timeout=0, base_delay=1.0, max_delay=30.0, **overrides)
+    return RequestScheduler(config, clock=clock, sleep=clock.sleep, rng=random.Random(1))
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_waits_for_refill_once_empty(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=2, clock=clock, sleep=clock.sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_float_rounding_does_not_stall(self):
+        # Regression: at t=14.0 the bucket held 0.9999999999999997 tokens and
+        # the sub-precision delay never advanced the clock
+        clock = FakeClock()
+        bucket = TokenBucket(25, capacity=25 * 10 / 60, clock=clock, sleep=clock.sleep)
+        for _ in range(60):
+            bucket.acquire()
+        self.assertLess(clock.now, 200)
+
+    def test_amount_larger_than_capacity_is_fully_charged(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=10, clock=clock, sleep=clock.sleep)
+        bucket.acquire(40)
+        # 10 tokens were in the bucket, the other 30 take 30 seconds to refill
+        self.assertAlmostEqual(clock.now, 30.0, places=2)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold_and_half_opens_after_timeout(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        clock.sleep(10)
+        breaker.allow()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class RequestSchedulerTest(unittest.TestCase):
+    def test_stays_within_provider_limits(self):
+        clock = FakeClock()
+        # A full bucket adds a burst on top of the steady rate, so leave headroom
+        scheduler = make_scheduler(clock, requests_per_minute=25, tokens_per_minute=100000)
+        provider = FakeProvider(requests_per_minute=30, clock=clock, sleep=clock.sleep)
+
+        for i in range(90):
+            scheduler.call(provider.complete, f"prompt {i}", estimated_tokens=10)
+
+        stats = scheduler.throughput()
+        self.assertEqual(provider.accepted, 90)
+        self.assertEqual(provider.rejected, 0)
+        self.assertEqual(stats['succeeded'], 90)
+        self.assertLessEqual(stats['requests_utilization'], 1.1)
+        self.assertGreater(stats['requests_utilization'], 0.8)
+
+    def test_retries_injected_throttling(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, requests_per_minute=600, failure_threshold=100)
+        provider = FakeProvider(requests_per_minute=600, throttle_rate=0.3,
+                                clock=clock, sleep=clock.sleep, rng=random.Random(3))
+
+        for i in range(50):
+            scheduler.call(provider.complete, f"prompt {i}")
+
+        self.assertEqual(provider.accepted, 50)
+        self.assertGreater(provider.rejected, 0)
+        self.assertEqual(scheduler.stats['throttled'], provider.rejected)
+        self.assertEqual(scheduler.stats['retries'], provider.rejected)
+
+    def test_honours_retry_after_when_provider_limit_is_lower(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, requests_per_minute=600, failure_threshold=100)
+        provider = FakeProvider(requests_per_minute=5, clock=clock, sleep=clock.sleep)
+
+        for i in range(10):
+            scheduler.call(provider.complete, f"prompt {i}")
+
+        self.assertEqual(provider.accepted, 10)
+        self.assertGreaterEqual(clock.now, 60.0)
+
+    def test_gives_up_after_max_retries(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, max_retries=2, failure_threshold=100)
+        provider = FakeProvider(requests_per_minute=600, throttle_rate=1.0, clock=clock, sleep=clock.sleep)
+
+        with self.assertRaises(RetriesExhaustedError):
+            scheduler.call(provider.complete, "prompt")
+        self.assertEqual(provider.rejected, 3)
+        self.assertEqual(scheduler.stats['failed'], 1)
+
+    def test_non_rate_limit_errors_are_not_retried(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with self.assertRaises(ValueError):
+            scheduler.call(broken)
+        self.assertEqual(len(calls), 1)
+
+    def test_throttling_does_not_trip_the_breaker(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, max_retries=6, failure_threshold=5)
+        provider = FakeProvider(requests_per_minute=600, throttle_rate=1.0, clock=clock, sleep=clock.sleep)
+
+        with self.assertRaises(RetriesExhaustedError):
+            scheduler.call(provider.complete, "prompt")
+        self.assertEqual(provider.rejected, 7)
+        self.assertEqual(scheduler.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_circuit_opens_on_repeated_failures(self):
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, failure_threshold=3, reset_timeout=1000)
+        calls = []
+
+        def unavailable():
+            calls.append(1)
+            raise ConnectionError("provider unavailable")
+
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                scheduler.call(unavailable)
+        with self.assertRaises(CircuitOpenError):
+            scheduler.call(unavailable)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(scheduler.stats['failed'], 4)
+
+    def test_times_out_slow_calls(self):
+        config = SchedulerConfig(timeout=0.05, max_retries=1, base_delay=0.0)
+        scheduler = RequestScheduler(config)
+
+        with self.assertRaises(RetriesExhaustedError):
+            scheduler.call(time.sleep, 0.2)
+        self.assertEqual(scheduler.stats['timeouts'], 2)
+
+    def test_queued_attempts_are_cancelled_on_timeout(self):
+        config = SchedulerConfig(timeout=0.05, max_retries=0, max_workers=1)
+        scheduler = RequestScheduler(config)
+        started = []
+
+        with self.assertRaises(RetriesExhaustedError):
+            scheduler.call(time.sleep, 0.3)
+        # The only worker is still busy with the abandoned attempt
+        with self.assertRaises(RetriesExhaustedError):
+            scheduler.call(started.append, 'late')
+        time.sleep(0.4)
+        self.assertEqual(started, [])
+
+    def test_timeout_starts_when_the_attempt_runs(self):
+        config = SchedulerConfig(timeout=0.2, max_retries=0, max_workers=1)
+        scheduler = RequestScheduler(config)
+        slow = threading.Thread(target=scheduler.call, args=(time.sleep, 0.1))
+        slow.start()
+        time.sleep(0.02)
+        # Waits about 0.08s for the worker, then runs for 0.15s
+        self.assertIsNone(scheduler.call(time.sleep, 0.15))
+        slow.join()
+
+    def test_detects_rate_limit_errors(self):
+        self.assertTrue(is_rate_limit_error(Exception("Error code: 429 - Rate limit reached for gpt-4o-mini")))
+        self.assertTrue(is_rate_limit_error(Exception("429 Too Many Requests")))
+        self.assertTrue(is_rate_limit_error(type('RateLimitError', (Exception,), {})("slow down")))
+        self.assertFalse(is_rate_limit_error(ValueError("bad request")))
+
+    def test_context_length_errors_are_not_rate_limits(self):
+        error = Exception("This model's maximum context length is 128000 tokens. "
+                          "However, your messages resulted in 142912 tokens.")
+        self.assertFalse(is_rate_limit_error(error))
+        self.assertFalse(is_rate_limit_error(ConnectionError("connect to 10.0.4.29 failed")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'crewai'))
+
+from plan_store import PlanStore, main, split_sections  # noqa: E402
+
+PLAN = "# Plan\n\n## User Story\nTrack time\n\n## Steps\n```\n# not a heading\n```\n"
+
+
+class PlanStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.store = PlanStore(self.dir / 'store')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_and_dedup(self):
+        entry = self.store.save(PLAN, 1)
+        self.assertEqual(self.store.render(entry['id']), PLAN)
+        self.assertEqual(entry['feature'], 'Track time')
+        self.assertEqual(self.store.save(PLAN, 1)['id'], entry['id'])
+        self.assertEqual(len(self.store.list()), 1)
+        self.assertEqual(''.join(split_sections(PLAN)), PLAN)
+
+    def test_get_needs_a_long_enough_prefix(self):
+        entry = self.store.save(PLAN, 1)
+        self.assertIsNone(self.store.get(entry['id'][:1]))
+        self.assertEqual(self.store.get(entry['id'][:8]), entry)
+
+    def test_show_prefers_issue_numbers(self):
+        entry = self.store.save(PLAN, 1)
+        issue = entry['id'][0] if entry['id'][0].isdigit() else '7'
+        other = self.store.save(PLAN + 'other\n', issue)
+        self.assertEqual(self.store.latest(issue), other)
+        with mock.patch('plan_store.PlanStore', return_value=self.store), \
+                mock.patch('sys.stdout', new_callable=io.StringIO) as out:
+            self.assertEqual(main(['plan_store.py', 'show', issue]), 0)
+        self.assertEqual(out.getvalue(), PLAN + 'other\n')
+
+    def test_import_accepts_any_issue_name(self):
+        (self.dir / 'issue_1-2_plan.md').write_text(PLAN, encoding='utf-8')
+        (self.dir / 'issue_7_plan.md').write_text(PLAN + 'x\n', encoding='utf-8')
+        imported = self.store.import_directory(self.dir)
+        self.assertEqual(sorted(entry['issue'] for entry in imported), ['1-2', '7'])
+
+    def test_concurrent_writers_keep_every_plan(self):
+        def save(n):
+            PlanStore(self.store.root).save(f"{PLAN}\n{n}\n", n)
+
+        threads = [threading.Thread(target=save, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(PlanStore(self.store.root).list()), 8)
+        self.assertFalse(self.store.lock_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'crewai'))
+
+from review_chunks import merge_review_findings, split_review_chunks  # noqa: E402
+
+DIFF = (
+    "diff --git a/app.js b/app.js\n--- a/app.js\n+++ b/app.js\n"
+    "@@ -1,2 +1,3 @@\n+const a = 1;\n@@ -10 +11 @@\n+const b = 2;\n"
+    "diff --git a/index.html b/index.html\n--- a/index.html\n+++ b/index.html\n"
+    "@@ -1 +1 @@\n+<p>Hi</p>\n"
+)
+
+
+class SplitReviewChunksTest(unittest.TestCase):
+    def test_splits_diff_per_file(self):
+        chunks = split_review_chunks(DIFF)
+        self.assertEqual([chunk['label'] for chunk in chunks], ['app.js', 'index.html'])
+        self.assertEqual(''.join(chunk['content'] for chunk in chunks), DIFF)
+
+    def test_splits_large_file_per_hunk_with_header(self):
+        chunks = split_review_chunks(DIFF, max_chars=90)
+        labels = [chunk['label'] for chunk in chunks]
+        self.assertIn('app.js hunk 1', labels)
+        self.assertIn('app.js hunk 2', labels)
+        hunk = next(chunk for chunk in chunks if chunk['label'] == 'app.js hunk 2')
+        self.assertTrue(hunk['content'].startswith('diff --git a/app.js'))
+
+    def test_keeps_large_sections_without_hunks(self):
+        binary = (
+            "diff --git a/logo.png b/logo.png\n--- a/logo.png\n+++ b/logo.png\n"
+            + "Binary files differ\n" * 20
+        )
+        chunks = split_review_chunks(DIFF + binary, max_chars=200)
+        labels = [chunk['label'] for chunk in chunks]
+        self.assertTrue(any(label.startswith('logo.png') for label in labels))
+        content = ''.join(chunk['content'] for chunk in chunks if chunk['label'].startswith('logo.png'))
+        self.assertEqual(content, binary)
+
+    def test_splits_fenced_blocks_and_labels_with_file_names(self):
+        output = "### app.js\n```javascript\nconst a = 1;\n```\nThen styles.css:\n```css\n.a {}\n```\n"
+        chunks = split_review_chunks(output)
+        self.assertEqual([chunk['label'] for chunk in chunks], ['app.js', 'styles.css'])
+        self.assertEqual(chunks[1]['content'], "Then styles.css:\n```css\n.a {}\n```")
+
+    def test_keeps_trailing_explanation(self):
+        output = "```js\nconst a = 1;\n```\n\n## Integration\nHooks into updateUI().\n"
+        chunks = split_review_chunks(output)
+        self.assertEqual(chunks[-1], {'label': 'explanation', 'content': "## Integration\nHooks into updateUI()."})
+
+    def test_plain_text_falls_back_to_one_chunk(self):
+        self.assertEqual(split_review_chunks("just text"), [{'label': 'output', 'content': 'just text'}])
+
+
+class MergeReviewFindingsTest(unittest.TestCase):
+    def test_deduplicates_list_items_and_ignores_prose(self):
+        report = merge_review_findings([
+            ('app.js', "## Review\nLooks good overall.\n- Uses var instead of const.\n- Missing null check"),
+            ('styles.css', "* uses var instead of const\n1. Numbered findings count too"),
+        ])
+        lines = report.splitlines()
+        self.assertIn("- Uses var instead of const. (app.js, styles.css)", lines)
+        self.assertIn("- Missing null check (app.js)", lines)
+        self.assertIn("- Numbered findings count too (styles.css)", lines)
+        self.assertFalse(any('Looks good' in line for line in lines))
+        self.assertEqual(len([line for line in lines if line.startswith('- ')]), 3)
+
+    def test_keeps_reviews_without_list_items(self):
+        report = merge_review_findings([
+            ('app.js', "- Missing null check"),
+            ('index.html', "The form lacks a label for the input."),
+        ])
+        self.assertIn("### index.html (review not in list form)", report)
+        self.assertIn("The form lacks a label for the input.", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import random
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'rollup'))
+
+from time_rollup import RollupIndex, range_buckets, rescan_summary  # noqa: E402
+
+
+def make_entries(start_id, days, per_day, end=date(2026, 10, 19), seed=0):
+    rng = random.Random(seed)
+    entries = []
+    entry_id = start_id
+    for offset in range(days):
+        day = end - timedelta(days=offset)
+        for _ in range(per_day):
+            entry_id += 1
+            entries.append({
+                'id': entry_id,
+                'project': rng.choice(['Website', 'Backend', 'Meetings']),
+                'duration': rng.randint(1000, 3_600_000),
+                'date': day.isoformat(),
+            })
+    return entries
+
+
+class RangeBucketsTest(unittest.TestCase):
+    def test_uses_months_and_weeks_for_whole_periods(self):
+        buckets = range_buckets(date(2026, 1, 1), date(2026, 3, 31))
+        self.assertEqual(buckets, [('month', '2026-01'), ('month', '2026-02'), ('month', '2026-03')])
+
+        buckets = range_buckets(date(2026, 10, 3), date(2026, 10, 19))
+        self.assertEqual(buckets[:2], [('day', '2026-10-03'), ('day', '2026-10-04')])
+        self.assertIn(('week', '2026-W41'), buckets)
+        self.assertEqual(buckets[-1], ('day', '2026-10-19'))
+
+
+class RollupIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / 'rollup.index.jsonl'
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_summaries_match_full_rescan(self):
+        entries = make_entries(1000, days=400, per_day=3)
+        index = RollupIndex(self.path)
+        index.ingest(entries)
+        for start, end in [
+            (date(2026, 10, 19), None),
+            (date(2025, 9, 14), date(2026, 10, 19)),
+            (date(2026, 2, 3), date(2026, 2, 27)),
+        ]:
+            self.assertEqual(index.summary(start, end), rescan_summary(entries, start, end))
+
+    def test_incremental_ingest_only_adds_new_entries(self):
+        old = make_entries(1000, days=30, per_day=2)
+        new = make_entries(5000, days=2, per_day=2, seed=1)
+        index = RollupIndex(self.path)
+        self.assertEqual(index.ingest(old), 60)
+        self.assertEqual(index.ingest(old + new), 4)
+        self.assertEqual(index.ingest(old + new), 0)
+
+        reloaded = RollupIndex(self.path)
+        start = date(2026, 9, 1)
+        self.assertEqual(reloaded.summary(start, date(2026, 10, 19)),
+                         rescan_summary(old + new, start, date(2026, 10, 19)))
+        self.assertEqual(reloaded.max_id, max(entry['id'] for entry in new))
+
+    def test_compact_keeps_totals(self):
+        entries = make_entries(1000, days=60, per_day=2)
+        index = RollupIndex(self.path)
+        index.ingest(entries[:50])
+        index.ingest(entries[50:])
+        before = index.summary(date(2026, 8, 1), date(2026, 10, 19))
+        index.compact()
+        self.assertEqual(len(self.path.read_text().splitlines()), 2)
+        self.assertEqual(RollupIndex(self.path).summary(date(2026, 8, 1), date(2026, 10, 19)), before)
+
+    def test_deleted_and_renamed_entries_trigger_rebuild(self):
+        day = date(2026, 10, 19)
+        entries = [
+            {'id': 1, 'project': 'A', 'duration': 1000, 'date': day.isoformat()},
+            {'id': 2, 'project': 'A', 'duration': 2000, 'date': day.isoformat()},
+        ]
+        index = RollupIndex(self.path)
+        index.ingest(entries)
+        self.assertEqual(index.summary(day), {'A': 3000})
+
+        # deleteEntry removes id 2; deleting project A renames id 1
+        export = [{**entries[0], 'project': 'Deleted Project'}]
+        index.ingest(export)
+        self.assertEqual(index.summary(day), rescan_summary(export, day))
+        self.assertEqual(RollupIndex(self.path).summary(day), {'Deleted Project': 1000})
+
+    def test_entries_without_id_are_skipped(self):
+        day = date(2026, 10, 19)
+        export = [
+            {'id': 1, 'project': 'A', 'duration': 5, 'date': day.isoformat()},
+            {'project': 'A', 'duration': 5, 'date': day.isoformat()},
+        ]
+        index = RollupIndex(self.path)
+        self.assertEqual(index.ingest(export), 1)
+        self.assertEqual(index.ingest(export), 0)
+        self.assertEqual(RollupIndex(self.path).summary(day), {'A': 5})
+
+
+if __name__ == '__main__':
+    unittest.main()